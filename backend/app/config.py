@@ -4,10 +4,17 @@ All sensitive data loaded from environment variables (.env file)
 NEVER hardcode secrets here!
 """
 
-from functools import lru_cache
+from functools import cached_property
+from operator import attrgetter
 
 from pydantic import field_validator
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+# Fields that must all be set for each integration to count as configured
+_SENDGRID_FIELDS = attrgetter("SENDGRID_API_KEY", "SENDGRID_FROM_EMAIL")
+_TWILIO_FIELDS = attrgetter("TWILIO_ACCOUNT_SID", "TWILIO_AUTH_TOKEN", "TWILIO_PHONE_NUMBER")
+_RETELL_FIELDS = attrgetter("RETELL_API_KEY", "RETELL_AGENT_ID", "RETELL_FROM_NUMBER")
 
 
 class Settings(BaseSettings):
@@ -47,6 +54,35 @@ class Settings(BaseSettings):
             return "postgresql+asyncpg://" + v[13:]
         return v
 
+    # Connection pool (per worker process)
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    # Recycle connections older than this many seconds (avoids stale server-side drops)
+    DATABASE_POOL_RECYCLE: int = 1800
+    # Per-connection prepared statement caches (asyncpg + SQLAlchemy adapter)
+    DATABASE_STATEMENT_CACHE_SIZE: int = 500
+    # Set when connecting through pgbouncer in transaction pooling mode: pgbouncer
+    # does the pooling (no app-side pool) and prepared statements are not cached,
+    # since the next transaction may run on a different server connection.
+    DATABASE_PGBOUNCER: bool = False
+    # SQLAlchemy compiled-SQL cache entries per engine (the app uses ~100 distinct statements)
+    DATABASE_QUERY_CACHE_SIZE: int = 500
+    # Run create_all + index DDL on startup. Turn off once the schema is managed
+    # by migrations run out-of-band, so workers skip the catalog round-trips.
+    DATABASE_AUTO_CREATE: bool = True
+
+    # ============================================
+    # CACHING
+    # ============================================
+    # Seconds a GET /api/dashboard response is reused (per worker). 0 = no caching.
+    DASHBOARD_CACHE_TTL: int = 15
+
+    # ============================================
+    # COMPRESSION
+    # ============================================
+    # Responses at least this many bytes are gzipped for clients that accept it
+    GZIP_MINIMUM_SIZE: int = 1024
+
     # ============================================
     # CORS - Frontend URLs allowed to access API
     # ============================================
@@ -70,6 +106,14 @@ class Settings(BaseSettings):
     # Set to 0 for unlimited (only after domain is warmed).
     SENDGRID_DAILY_SEND_LIMIT: int = 100
 
+    # Max SendGrid API requests per second from this process (token bucket).
+    # Keeps large campaigns under SendGrid's rate limits instead of eating 429s.
+    # Set to 0 to disable throttling.
+    SENDGRID_RPS: int = 10
+
+    # Max emails send_bulk() has in flight at once (the RPS limit above still applies)
+    SENDGRID_SEND_CONCURRENCY: int = 10
+
     # ============================================
     # OPENAI - AI Classification (Optional for demo)
     # ============================================
@@ -104,77 +148,90 @@ class Settings(BaseSettings):
     # ============================================
     SECRET_KEY: str = "change-this-in-production-use-strong-random-key"
 
-    class Config:
+    model_config = SettingsConfigDict(
         # Load from .env file
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+        env_file=".env",
+        env_file_encoding="utf-8",
         # Allow extra fields in .env
-        extra = "ignore"
+        extra="ignore",
+        # Read-only after startup: assigning to a field raises instead of silently diverging
+        frozen=True,
+    )
 
     # ============================================
     # COMPUTED PROPERTIES
     # ============================================
+    # Settings never change after startup, so these are computed on first
+    # access and then served as plain instance attributes.
 
-    @property
-    def cors_origins_list(self) -> list:
-        """Convert comma-separated CORS origins to list"""
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+    @cached_property
+    def cors_origins_list(self) -> tuple[str, ...]:
+        """Comma-separated CORS origins as a tuple (parsed once, empty entries dropped)"""
+        return tuple(origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip())
 
-    @property
+    @cached_property
+    def cors_origins_set(self) -> frozenset[str]:
+        """CORS origins as a frozenset for O(1) membership checks"""
+        return frozenset(self.cors_origins_list)
+
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production"""
         return self.APP_ENV == "production"
 
-    @property
+    @cached_property
     def is_development(self) -> bool:
         """Check if running in development"""
         return self.APP_ENV == "development"
 
-    @property
+    @cached_property
     def sendgrid_configured(self) -> bool:
         """Check if SendGrid is configured"""
-        return bool(self.SENDGRID_API_KEY and self.SENDGRID_FROM_EMAIL)
+        return all(_SENDGRID_FIELDS(self))
 
-    @property
+    @cached_property
     def twilio_configured(self) -> bool:
         """Check if Twilio SMS is configured"""
-        return bool(self.TWILIO_ACCOUNT_SID and self.TWILIO_AUTH_TOKEN and self.TWILIO_PHONE_NUMBER)
+        return all(_TWILIO_FIELDS(self))
 
-    @property
+    @cached_property
     def openai_configured(self) -> bool:
         """Check if OpenAI is configured"""
         return bool(self.OPENAI_API_KEY)
 
-    @property
+    @cached_property
     def retell_configured(self) -> bool:
         """Check if Retell AI voice is configured"""
-        return bool(self.RETELL_API_KEY and self.RETELL_AGENT_ID and self.RETELL_FROM_NUMBER)
+        return all(_RETELL_FIELDS(self))
 
-    @property
+    @cached_property
     def calendly_configured(self) -> bool:
         """Check if Calendly is configured"""
         return bool(self.CALENDLY_API_TOKEN)
 
-    @property
+    @cached_property
     def webhook_secret_configured(self) -> bool:
         """True when the SendGrid webhook secret is set"""
         return bool(self.SENDGRID_WEBHOOK_SECRET)
 
 
-@lru_cache
+# Module-level singleton — import this directly instead of calling get_settings()
+settings: Settings = Settings()
+
+
 def get_settings() -> Settings:
     """
-    Get cached settings instance.
-    Uses lru_cache to avoid reading .env file on every request.
+    Get the shared settings instance.
+    Kept for backwards compatibility (e.g. Depends(get_settings));
+    prefer `from app.config import settings`.
     """
-    return Settings()
+    return settings
 
 
 # ============================================
 # USAGE EXAMPLE
 # ============================================
-# from app.config import get_settings
+# from app.config import settings
 #
-# settings = get_settings()
 # print(settings.DATABASE_URL)
 # print(settings.sendgrid_configured)
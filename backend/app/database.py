@@ -3,20 +3,52 @@ Database Configuration
 All database connections managed here.
 """
 
+from uuid import uuid4
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool
 
-from app.config import get_settings
+from app.config import settings
+
 
-# Get settings
-settings = get_settings()
+# Connection strategy — pick one, never both:
+# - Direct to Postgres (default): SQLAlchemy's async queue pool keeps connections
+#   open so requests skip the TCP/TLS handshake + auth, and each connection
+#   caches prepared statements so hot queries are not re-prepared.
+# - Behind pgbouncer in transaction mode (DATABASE_PGBOUNCER=true): pgbouncer
+#   is the pool, so the app opens/closes per checkout (NullPool). Statement
+#   caches are off and names are unique, because a statement prepared in one
+#   transaction may not exist on the server connection the next one gets.
+if settings.DATABASE_PGBOUNCER:
+    _pool_args = {"poolclass": NullPool}
+    _connect_args = {
+        "prepared_statement_cache_size": 0,
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+else:
+    _pool_args = {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_pre_ping": True,  # Transparently replace connections dropped by the server
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+    _connect_args = {
+        # Reuse parsed/planned statements per connection instead of re-preparing every query
+        "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
 
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
-    poolclass=NullPool,
+    echo=settings.DEBUG and not settings.is_production,  # Log SQL queries in debug mode (never in prod)
+    # Compiled SQL is cached by statement shape, so hot queries skip the Python compile step
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+    connect_args=_connect_args,
+    **_pool_args,
 )
 
 # Create async session factory
@@ -28,8 +60,10 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
-# Base class for models
-Base = declarative_base()
+
+# Base class for models (SQLAlchemy 2.0 typed declarative: Mapped[...] + mapped_column)
+class Base(DeclarativeBase):
+    pass
 
 
 async def get_db():
@@ -37,6 +71,9 @@ async def get_db():
     Dependency that provides a database session.
     Yields an async session and ensures it's closed after use.
 
+    Endpoints that write must call `await db.commit()` themselves;
+    read-only requests never issue a COMMIT.
+
     Usage in FastAPI:
         @app.get("/items")
         async def get_items(db: AsyncSession = Depends(get_db)):
@@ -45,21 +82,125 @@ async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
+
+
+# Set once the schema has been checked in this process, so repeat calls are free
+_schema_initialized = False
 
 
 async def init_db():
     """
     Initialize database tables.
     Called on application startup.
+
+    Skipped when DATABASE_AUTO_CREATE is off (schema managed by migrations).
     """
+    global _schema_initialized
+    if _schema_initialized or not settings.DATABASE_AUTO_CREATE:
+        return
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all never alters existing tables; bring older databases up to date
+        for ddl in SCHEMA_UPGRADES:
+            await conn.execute(text(ddl))
+
+    await _create_trigram_indexes()
+    _schema_initialized = True
+
+
+# Idempotent DDL for columns/indexes added after the first deploy (no-ops on a fresh schema)
+SCHEMA_UPGRADES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_leads_email_lower ON leads (lower(email))",
+    "ALTER TABLE email_sequences ADD COLUMN IF NOT EXISTS campaign_id INTEGER "
+    "REFERENCES campaigns (id) ON DELETE SET NULL ON UPDATE CASCADE",
+    "CREATE INDEX IF NOT EXISTS idx_email_sequences_campaign_id_created_at "
+    "ON email_sequences (campaign_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_email_sequences_sent_at ON email_sequences (sent_at) WHERE sent_at IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS idx_email_sequences_opened_at "
+    "ON email_sequences (opened_at) WHERE opened_at IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS idx_email_sequences_replied_at "
+    "ON email_sequences (replied_at) WHERE replied_at IS NOT NULL",
+    "ALTER TABLE lead_import_jobs ADD COLUMN IF NOT EXISTS errors_truncated INTEGER NOT NULL DEFAULT 0",
+    # (created_at, id) serves the campaign list's keyset seek and replaces the created_at-only index
+    "CREATE INDEX IF NOT EXISTS idx_campaigns_created_at_id ON campaigns (created_at, id)",
+    "DROP INDEX IF EXISTS idx_campaigns_created_at",
+    # (status, created_at) serves status filters ordered by created_at and replaces the status-only index
+    "CREATE INDEX IF NOT EXISTS idx_email_sequences_status_created_at ON email_sequences (status, created_at)",
+    "DROP INDEX IF EXISTS idx_email_sequences_status",
+)
+
+
+# Timestamp columns that older deploys created as "timestamp without time zone".
+# Their stored values are naive UTC, so they're converted AT TIME ZONE 'UTC'.
+TIMESTAMPTZ_COLUMNS = {
+    "ai_lead_scores": ("scored_at", "created_at"),
+    "ai_patterns": ("created_at",),
+    "bookings": ("scheduled_time", "created_at", "updated_at"),
+    "campaign_variations": ("created_at",),
+    "campaigns": ("started_at", "ended_at", "created_at", "updated_at"),
+    "chatbot_messages": ("created_at",),
+    "email_sequences": ("sent_at", "opened_at", "clicked_at", "replied_at", "created_at", "updated_at"),
+    "email_templates": ("created_at", "updated_at"),
+    "lead_import_jobs": ("created_at", "finished_at"),
+    "leads": ("created_at", "updated_at"),
+    "replies": ("received_at", "processed_at", "created_at"),
+    "sms_messages": ("sent_at", "created_at"),
+    "voice_calls": ("started_at", "ended_at", "created_at"),
+}
+
+
+def _timestamptz_upgrade() -> str:
+    """
+    One DO block converting every TIMESTAMPTZ_COLUMNS column that still has no
+    time zone. Columns already converted are skipped, so it's safe on every
+    startup (re-running the USING clause on a timestamptz column would shift it).
+    """
+    columns = ", ".join(f"('{table}', '{column}')" for table, names in TIMESTAMPTZ_COLUMNS.items() for column in names)
+    return f"""
+        DO $$
+        DECLARE col record;
+        BEGIN
+            FOR col IN
+                SELECT table_name, column_name FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                  AND data_type = 'timestamp without time zone'
+                  AND (table_name, column_name) IN ({columns})
+            LOOP
+                EXECUTE format(
+                    'ALTER TABLE %I ALTER COLUMN %I TYPE timestamptz USING %I AT TIME ZONE ''UTC''',
+                    col.table_name, col.column_name, col.column_name
+                );
+            END LOOP;
+        END $$
+    """
+
+
+SCHEMA_UPGRADES += (_timestamptz_upgrade(),)
+
+
+# Substring search (ILIKE '%...%') can't use a btree index; these GIN trigram
+# indexes let Postgres serve it without a sequential scan.
+TRIGRAM_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_campaigns_name_trgm ON campaigns USING gin (name gin_trgm_ops)",
+)
+
+
+async def _create_trigram_indexes():
+    """
+    Best-effort: pg_trgm is a contrib extension that not every Postgres
+    install ships, so search keeps working (just unindexed) without it.
+    """
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for ddl in TRIGRAM_INDEXES:
+                await conn.execute(text(ddl))
+    except Exception as e:
+        print(f"⚠️  Trigram search indexes not created (pg_trgm unavailable?): {e}")
 
 
 async def close_db():
@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 
 from sqlalchemy import (
     Boolean,
     CheckConstraint,
-    Column,
+    Date,
     DateTime,
     ForeignKey,
     Index,
@@ -11,9 +12,11 @@ from sqlalchemy import (
     Numeric,
     String,
     Text,
+    func,
     text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
@@ -24,15 +27,17 @@ from app.database import Base
 class EmailTemplate(Base):
     __tablename__ = "email_templates"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), unique=True, nullable=False)
-    subject = Column(String(255), nullable=False)
-    body = Column(Text, nullable=False)
-    is_default = Column(Boolean, default=False, server_default=text("FALSE"))
-    created_by = Column(String(100))
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    is_default: Mapped[bool | None] = mapped_column(Boolean, default=False, server_default=text("FALSE"))
+    created_by: Mapped[str | None] = mapped_column(String(100))
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP")
     )
 
     __table_args__ = (
@@ -47,17 +52,19 @@ class EmailTemplate(Base):
 class Campaign(Base):
     __tablename__ = "campaigns"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
-    description = Column(Text)
-    email_template = Column(Text)
-    status = Column(String(50), default="draft", server_default=text("'draft'"))
-    started_at = Column(DateTime)
-    ended_at = Column(DateTime)
-    created_by = Column(String(100))
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text)
+    email_template: Mapped[str | None] = mapped_column(Text)
+    status: Mapped[str | None] = mapped_column(String(50), default="draft", server_default=text("'draft'"))
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    ended_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    created_by: Mapped[str | None] = mapped_column(String(100))
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP")
     )
 
     __table_args__ = (
@@ -65,7 +72,7 @@ class Campaign(Base):
             "status IN ('draft', 'scheduled', 'active', 'completed', 'paused')", name="campaigns_status_check"
         ),
         Index("idx_campaigns_status", "status"),
-        Index("idx_campaigns_created_at", "created_at"),
+        Index("idx_campaigns_created_at_id", "created_at", "id"),
         Index("idx_campaigns_created_by", "created_by"),
     )
 
@@ -76,38 +83,50 @@ class Campaign(Base):
 class Lead(Base):
     __tablename__ = "leads"
 
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String(255), unique=True, nullable=False)
-    first_name = Column(String(100), nullable=False)
-    last_name = Column(String(100))
-    company = Column(String(100))
-    phone = Column(String(20))
-    address = Column(String(255))
-    property_type = Column(String(100))
-    estimated_value = Column(String(50))
-    status = Column(String(50), default="uploaded", server_default=text("'uploaded'"))
-    notes = Column(Text)
-    created_by = Column(String(100))
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP")
-    )
-
-    # Relationships (CASCADE delete)
-    email_sequences = relationship("EmailSequence", back_populates="lead", cascade="all, delete-orphan")
-    replies = relationship("Reply", back_populates="lead", cascade="all, delete-orphan")
-    bookings = relationship("Booking", back_populates="lead", cascade="all, delete-orphan")
-    sms_messages = relationship(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    first_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    last_name: Mapped[str | None] = mapped_column(String(100))
+    company: Mapped[str | None] = mapped_column(String(100))
+    phone: Mapped[str | None] = mapped_column(String(20))
+    address: Mapped[str | None] = mapped_column(String(255))
+    property_type: Mapped[str | None] = mapped_column(String(100))
+    estimated_value: Mapped[str | None] = mapped_column(String(50))
+    status: Mapped[str | None] = mapped_column(String(50), default="uploaded", server_default=text("'uploaded'"))
+    notes: Mapped[str | None] = mapped_column(Text)
+    created_by: Mapped[str | None] = mapped_column(String(100))
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP")
+    )
+
+    # Relationships (CASCADE delete, done by the database's ON DELETE CASCADE foreign keys)
+    email_sequences: Mapped[list["EmailSequence"]] = relationship(
+        "EmailSequence", back_populates="lead", cascade="all, delete-orphan", passive_deletes=True
+    )
+    replies: Mapped[list["Reply"]] = relationship(
+        "Reply", back_populates="lead", cascade="all, delete-orphan", passive_deletes=True
+    )
+    bookings: Mapped[list["Booking"]] = relationship(
+        "Booking", back_populates="lead", cascade="all, delete-orphan", passive_deletes=True
+    )
+    sms_messages: Mapped[list["SmsMessage"]] = relationship(
         "SmsMessage",
         back_populates="lead",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
-    voice_calls = relationship(
+    voice_calls: Mapped[list["VoiceCall"]] = relationship(
         "VoiceCall",
         back_populates="lead",
         cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    ai_score: Mapped["AiLeadScore | None"] = relationship(
+        "AiLeadScore", back_populates="lead", uselist=False, cascade="all, delete-orphan", passive_deletes=True
     )
-    ai_score = relationship("AiLeadScore", back_populates="lead", uselist=False, cascade="all, delete-orphan")
 
     __table_args__ = (
         CheckConstraint(
@@ -115,6 +134,9 @@ class Lead(Base):
             name="leads_status_check",
         ),
         Index("idx_leads_email", "email"),
+        # Case-insensitive uniqueness, enforced by Postgres: "John@X.com" and
+        # "john@x.com" are the same lead. Lead inserts use it as the ON CONFLICT target.
+        Index("idx_leads_email_lower", text("lower(email)"), unique=True),
         Index("idx_leads_status", "status"),
         Index("idx_leads_created_at", "created_at"),
         Index("idx_leads_created_by", "created_by"),
@@ -127,25 +149,32 @@ class Lead(Base):
 class EmailSequence(Base):
     __tablename__ = "email_sequences"
 
-    id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    sequence_day = Column(Integer, default=1, server_default=text("1"))
-    email_subject = Column(String(255))
-    email_body = Column(Text)
-    status = Column(String(50), default="pending", server_default=text("'pending'"))
-    sent_at = Column(DateTime, nullable=True)
-    opened_at = Column(DateTime, nullable=True)
-    clicked_at = Column(DateTime, nullable=True)
-    replied_at = Column(DateTime, nullable=True)
-    sendgrid_message_id = Column(String(255))
-    bounce_reason = Column(String(255))
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    lead_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False
+    )
+    campaign_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("campaigns.id", ondelete="SET NULL", onupdate="CASCADE"), nullable=True
+    )
+    sequence_day: Mapped[int | None] = mapped_column(Integer, default=1, server_default=text("1"))
+    email_subject: Mapped[str | None] = mapped_column(String(255))
+    email_body: Mapped[str | None] = mapped_column(Text)
+    status: Mapped[str | None] = mapped_column(String(50), default="pending", server_default=text("'pending'"))
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    opened_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    clicked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    replied_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    sendgrid_message_id: Mapped[str | None] = mapped_column(String(255))
+    bounce_reason: Mapped[str | None] = mapped_column(String(255))
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP")
     )
 
     # Relationship
-    lead = relationship("Lead", back_populates="email_sequences")
+    lead: Mapped["Lead"] = relationship("Lead", back_populates="email_sequences")
 
     __table_args__ = (
         CheckConstraint(
@@ -153,9 +182,17 @@ class EmailSequence(Base):
             name="email_sequences_status_check",
         ),
         Index("idx_email_sequences_lead_id", "lead_id"),
-        Index("idx_email_sequences_status", "status"),
+        # Campaign email lists: campaign_id = ? ORDER BY created_at DESC
+        Index("idx_email_sequences_campaign_id_created_at", "campaign_id", "created_at"),
+        # Serves status filters and status + ORDER BY created_at (scanned backward for DESC)
+        Index("idx_email_sequences_status_created_at", "status", "created_at"),
         Index("idx_email_sequences_created_at", "created_at"),
         Index("idx_email_sequences_sendgrid_message_id", "sendgrid_message_id"),
+        # Partial indexes for dashboard time windows (sent_at >= ..., ORDER BY sent_at DESC).
+        # Only rows that have the event are indexed, so queued/unopened history adds nothing.
+        Index("idx_email_sequences_sent_at", "sent_at", postgresql_where=text("sent_at IS NOT NULL")),
+        Index("idx_email_sequences_opened_at", "opened_at", postgresql_where=text("opened_at IS NOT NULL")),
+        Index("idx_email_sequences_replied_at", "replied_at", postgresql_where=text("replied_at IS NOT NULL")),
     )
 
 
@@ -165,20 +202,24 @@ class EmailSequence(Base):
 class Reply(Base):
     __tablename__ = "replies"
 
-    id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    email_from = Column(String(255))
-    email_subject = Column(String(255))
-    email_body = Column(Text)
-    sentiment = Column(String(50), nullable=True, default=None)
-    confidence_score = Column(Numeric(3, 2), nullable=True)
-    ai_model_used = Column(String(50))
-    received_at = Column(DateTime, nullable=True)
-    processed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    lead_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False
+    )
+    email_from: Mapped[str | None] = mapped_column(String(255))
+    email_subject: Mapped[str | None] = mapped_column(String(255))
+    email_body: Mapped[str | None] = mapped_column(Text)
+    sentiment: Mapped[str | None] = mapped_column(String(50), nullable=True, default=None)
+    confidence_score: Mapped[Decimal | None] = mapped_column(Numeric(3, 2), nullable=True)
+    ai_model_used: Mapped[str | None] = mapped_column(String(50))
+    received_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
 
     # Relationship
-    lead = relationship("Lead", back_populates="replies")
+    lead: Mapped["Lead"] = relationship("Lead", back_populates="replies")
 
     __table_args__ = (
         CheckConstraint(
@@ -201,20 +242,24 @@ class Reply(Base):
 class Booking(Base):
     __tablename__ = "bookings"
 
-    id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(Integer, ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
-    calendly_event_id = Column(String(255))
-    event_uri = Column(String(255))
-    scheduled_time = Column(DateTime, nullable=False)
-    calendly_invitee_email = Column(String(255))
-    calendly_response_status = Column(String(50), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
-    updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    lead_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False
+    )
+    calendly_event_id: Mapped[str | None] = mapped_column(String(255))
+    event_uri: Mapped[str | None] = mapped_column(String(255))
+    scheduled_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    calendly_invitee_email: Mapped[str | None] = mapped_column(String(255))
+    calendly_response_status: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), onupdate=func.now(), server_default=text("CURRENT_TIMESTAMP")
     )
 
     # Relationship
-    lead = relationship("Lead", back_populates="bookings")
+    lead: Mapped["Lead"] = relationship("Lead", back_populates="bookings")
 
     __table_args__ = (
         CheckConstraint(
@@ -233,22 +278,21 @@ class Booking(Base):
 class ChatbotMessage(Base):
     __tablename__ = "chatbot_messages"
 
-    id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    lead_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"),
         nullable=False,
     )
-    role = Column(String(20), nullable=False)  # "user" | "assistant" | "system"
-    content = Column(Text, nullable=False)
-    created_at = Column(
-        DateTime,
-        default=datetime.utcnow,
+    role: Mapped[str] = mapped_column(String(20), nullable=False)  # "user" | "assistant" | "system"
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
         server_default=text("CURRENT_TIMESTAMP"),
     )
 
     # Relationship back to lead (one-to-many)
-    lead = relationship("Lead", backref="chatbot_messages")
+    lead: Mapped["Lead"] = relationship("Lead", backref="chatbot_messages")
 
     __table_args__ = (
         Index("idx_chatbot_messages_lead_id", "lead_id"),
@@ -265,24 +309,25 @@ class ChatbotMessage(Base):
 class SmsMessage(Base):
     __tablename__ = "sms_messages"
 
-    id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    lead_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"),
         nullable=False,
     )
-    to_number = Column(String(20), nullable=False)  # E.164
-    body = Column(Text, nullable=False)
-    status = Column(String(50), default="pending", server_default=text("'pending'"))
-    twilio_sid = Column(String(255), nullable=True)  # Twilio Message SID for status callbacks
-    sent_at = Column(DateTime, nullable=True)
-    created_at = Column(
-        DateTime,
-        default=datetime.utcnow,
+    to_number: Mapped[str] = mapped_column(String(20), nullable=False)  # E.164
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str | None] = mapped_column(String(50), default="pending", server_default=text("'pending'"))
+    twilio_sid: Mapped[str | None] = mapped_column(
+        String(255), nullable=True
+    )  # Twilio Message SID for status callbacks
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
         server_default=text("CURRENT_TIMESTAMP"),
     )
 
-    lead = relationship("Lead", back_populates="sms_messages")
+    lead: Mapped["Lead"] = relationship("Lead", back_populates="sms_messages")
 
     __table_args__ = (
         CheckConstraint(
@@ -301,30 +346,29 @@ class SmsMessage(Base):
 class VoiceCall(Base):
     __tablename__ = "voice_calls"
 
-    id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    lead_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"),
         nullable=False,
     )
-    to_number = Column(String(20), nullable=False)
-    retell_call_id = Column(String(255), nullable=True)
-    retell_agent_id = Column(String(255), nullable=True)
-    status = Column(String(50), default="pending", server_default=text("'pending'"))
-    duration_seconds = Column(Integer, nullable=True)
-    call_summary = Column(Text, nullable=True)
-    call_outcome = Column(String(50), nullable=True)
-    transcript = Column(Text, nullable=True)
-    recording_url = Column(String(500), nullable=True)
-    started_at = Column(DateTime, nullable=True)
-    ended_at = Column(DateTime, nullable=True)
-    created_at = Column(
-        DateTime,
-        default=datetime.utcnow,
+    to_number: Mapped[str] = mapped_column(String(20), nullable=False)
+    retell_call_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    retell_agent_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[str | None] = mapped_column(String(50), default="pending", server_default=text("'pending'"))
+    duration_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    call_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    call_outcome: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
+    recording_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    ended_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
         server_default=text("CURRENT_TIMESTAMP"),
     )
 
-    lead = relationship("Lead", back_populates="voice_calls")
+    lead: Mapped["Lead"] = relationship("Lead", back_populates="voice_calls")
 
     __table_args__ = (
         CheckConstraint(
@@ -348,23 +392,27 @@ class VoiceCall(Base):
 class AiLeadScore(Base):
     __tablename__ = "ai_lead_scores"
 
-    id = Column(Integer, primary_key=True, index=True)
-    lead_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    lead_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("leads.id", ondelete="CASCADE", onupdate="CASCADE"),
         nullable=False,
         unique=True,
     )
-    score = Column(Integer, nullable=False)  # 0-100
-    priority = Column(String(20), nullable=False)  # Hot / Warm / Cold / Dead
-    reasoning = Column(Text, nullable=True)
-    recommended_campaign = Column(String(255), nullable=True)
-    personalization_hints = Column(Text, nullable=True)
-    ai_model_used = Column(String(50), nullable=True)
-    scored_at = Column(DateTime, default=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    score: Mapped[int] = mapped_column(Integer, nullable=False)  # 0-100
+    priority: Mapped[str] = mapped_column(String(20), nullable=False)  # Hot / Warm / Cold / Dead
+    reasoning: Mapped[str | None] = mapped_column(Text, nullable=True)
+    recommended_campaign: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    personalization_hints: Mapped[str | None] = mapped_column(Text, nullable=True)
+    ai_model_used: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    scored_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
 
-    lead = relationship("Lead", back_populates="ai_score")
+    lead: Mapped["Lead"] = relationship("Lead", back_populates="ai_score")
 
     __table_args__ = (
         CheckConstraint("score >= 0 AND score <= 100", name="ai_lead_scores_score_check"),
@@ -384,22 +432,24 @@ class AiLeadScore(Base):
 class CampaignVariation(Base):
     __tablename__ = "campaign_variations"
 
-    id = Column(Integer, primary_key=True, index=True)
-    campaign_id = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    campaign_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("campaigns.id", ondelete="CASCADE", onupdate="CASCADE"),
         nullable=False,
     )
-    label = Column(String(10), nullable=False)  # "A", "B", "C", "D", "E"
-    subject = Column(String(255), nullable=False)
-    body = Column(Text, nullable=False)
-    psychological_trigger = Column(String(100), nullable=True)
-    sends = Column(Integer, default=0, server_default=text("0"))
-    opens = Column(Integer, default=0, server_default=text("0"))
-    clicks = Column(Integer, default=0, server_default=text("0"))
-    replies = Column(Integer, default=0, server_default=text("0"))
-    is_winner = Column(Boolean, default=False, server_default=text("FALSE"))
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    label: Mapped[str] = mapped_column(String(10), nullable=False)  # "A", "B", "C", "D", "E"
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    psychological_trigger: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    sends: Mapped[int | None] = mapped_column(Integer, default=0, server_default=text("0"))
+    opens: Mapped[int | None] = mapped_column(Integer, default=0, server_default=text("0"))
+    clicks: Mapped[int | None] = mapped_column(Integer, default=0, server_default=text("0"))
+    replies: Mapped[int | None] = mapped_column(Integer, default=0, server_default=text("0"))
+    is_winner: Mapped[bool | None] = mapped_column(Boolean, default=False, server_default=text("FALSE"))
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
 
     __table_args__ = (
         Index("idx_campaign_variations_campaign_id", "campaign_id"),
@@ -413,15 +463,61 @@ class CampaignVariation(Base):
 class AiPattern(Base):
     __tablename__ = "ai_patterns"
 
-    id = Column(Integer, primary_key=True, index=True)
-    pattern = Column(Text, nullable=False)  # Plain English description
-    category = Column(String(50), nullable=False)  # "subject_line", "body_copy", "send_time", "audience", etc.
-    confidence = Column(Numeric(3, 2), nullable=True)  # 0.00-1.00
-    sample_size = Column(Integer, nullable=True)  # How many emails this pattern is based on
-    source_campaign_id = Column(Integer, nullable=True)  # Which campaign produced this learning
-    created_at = Column(DateTime, default=datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    pattern: Mapped[str] = mapped_column(Text, nullable=False)  # Plain English description
+    category: Mapped[str] = mapped_column(
+        String(50), nullable=False
+    )  # "subject_line", "body_copy", "send_time", "audience", etc.
+    confidence: Mapped[Decimal | None] = mapped_column(Numeric(3, 2), nullable=True)  # 0.00-1.00
+    sample_size: Mapped[int | None] = mapped_column(Integer, nullable=True)  # How many emails this pattern is based on
+    source_campaign_id: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )  # Which campaign produced this learning
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
 
     __table_args__ = (
         Index("idx_ai_patterns_category", "category"),
         Index("idx_ai_patterns_created_at", "created_at"),
     )
+
+
+# ============================================
+# TABLE 13: LEAD_IMPORT_JOBS (background CSV imports)
+# ============================================
+class LeadImportJob(Base):
+    __tablename__ = "lead_import_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending", server_default=text("'pending'"))
+    # Same counts as CSVUploadResponse, filled in when the import finishes
+    total_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    valid_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    invalid_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    duplicates: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    created: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    errors: Mapped[list[str] | None] = mapped_column(JSONB, nullable=True)  # Row errors, or the failure reason
+    errors_truncated: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'running', 'completed', 'failed')",
+            name="lead_import_jobs_status_check",
+        ),
+    )
+
+
+# ============================================
+# TABLE 14: DAILY_SEND_COUNTS (email warming limit)
+# ============================================
+class DailySendCount(Base):
+    __tablename__ = "daily_send_counts"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)  # UTC date
+    sent: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
@@ -1,18 +1,22 @@
 from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.models import AiPattern, Campaign, CampaignVariation, EmailSequence, EmailTemplate, Lead
 from app.schemas import (
     ABTestWinner,
     AiPatternResponse,
     CampaignBrief,
     CampaignCreate,
+    CampaignCursor,
     CampaignGenerateResponse,
     CampaignListResponse,
+    CampaignQuickStartRequest,
     CampaignResponse,
     CampaignStartRequest,
     CampaignUpdate,
@@ -20,10 +24,15 @@ from app.schemas import (
     MessageResponse,
 )
 from app.utils.ai_service import analyze_ab_test, generate_email_variations
-from app.utils.email_service import EmailService, email_service
+from app.utils.cache import dashboard_cache
+from app.utils.email_service import SENDGRID_MAX_PERSONALIZATIONS, EmailService, email_service
+from app.utils.pagination import fetch_page
 
 router = APIRouter()
 
+# Validates a whole page of ORM rows in one call instead of one model_validate per row
+_campaign_list_adapter = TypeAdapter(list[CampaignResponse])
+
 
 # ============================================
 # CREATE CAMPAIGN
@@ -58,46 +67,56 @@ async def create_campaign(campaign_data: CampaignCreate, db: AsyncSession = Depe
 async def get_campaigns(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    status: str | None = Query(None, pattern="^(draft|scheduled|active|completed|paused)$"),
+    status: Literal["draft", "scheduled", "active", "completed", "paused"] | None = Query(None),
     search: str | None = Query(None, description="Search by name"),
+    after: datetime | None = Query(None, description="Keyset cursor: created_at of the last campaign seen"),
+    after_id: int | None = Query(None, description="Keyset cursor: id of the last campaign seen"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get all campaigns with pagination and filters"""
-
-    # Build query
-    query = select(Campaign)
-
-    if status:
-        query = query.where(Campaign.status == status)
+    """
+    Get all campaigns with pagination and filters.
 
-    if search:
-        query = query.where(Campaign.name.ilike(f"%{search}%"))
+    Pass `after` + `after_id` (from `next_cursor`) to seek past the last row
+    seen instead of using `page` — deep pages then cost the same as the first.
+    In cursor mode `page` is ignored and `total` counts the remaining campaigns.
+    """
+    if (after is None) != (after_id is None):
+        raise HTTPException(status_code=400, detail="Provide both after and after_id, or neither")
 
-    # Get total count
-    count_query = select(func.count()).select_from(Campaign)
+    # Build filters
+    filters = []
     if status:
-        count_query = count_query.where(Campaign.status == status)
+        filters.append(Campaign.status == status)
     if search:
-        count_query = count_query.where(Campaign.name.ilike(f"%{search}%"))
+        # ILIKE '%...%' with % and _ escaped — served by idx_campaigns_name_trgm
+        filters.append(Campaign.name.icontains(search, autoescape=True))
 
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    if after is not None:
+        # Seek on (created_at, id) — served by idx_campaigns_created_at_id
+        filters.append(tuple_(Campaign.created_at, Campaign.id) < (after, after_id))
+        page = 1
 
-    # Pagination
-    total_pages = (total + per_page - 1) // per_page
     offset = (page - 1) * per_page
 
-    query = query.order_by(Campaign.created_at.desc()).offset(offset).limit(per_page)
+    # Page + total count
+    campaigns, total = await fetch_page(
+        db, Campaign, filters, (Campaign.created_at.desc(), Campaign.id.desc()), offset, per_page
+    )
 
-    result = await db.execute(query)
-    campaigns = result.scalars().all()
+    total_pages = (total + per_page - 1) // per_page
+
+    next_cursor = None
+    if campaigns and offset + len(campaigns) < total:
+        last = campaigns[-1]
+        next_cursor = CampaignCursor(after=last.created_at, after_id=last.id)
 
     return CampaignListResponse(
         total=total,
         page=page,
         per_page=per_page,
         total_pages=total_pages,
-        items=[CampaignResponse.model_validate(c) for c in campaigns],
+        items=_campaign_list_adapter.validate_python(campaigns, from_attributes=True),
+        next_cursor=next_cursor,
     )
 
 
@@ -120,26 +139,39 @@ async def get_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
     if not campaign:
         raise HTTPException(status_code=404, detail=f"Campaign with ID {campaign_id} not found")
 
-    # Get campaign statistics from email_sequences
-    # Note: We track campaign membership through a naming convention in email_subject
-    # In production, you'd add a campaign_id FK to EmailSequence
+    # Get campaign statistics from email_sequences in a single aggregate query
+    # (index lookup on idx_email_sequences_campaign_id_created_at)
+    stats = {
+        "total_leads": 0,
+        "emails_sent": 0,
+        "emails_opened": 0,
+        "emails_replied": 0,
+        "emails_bounced": 0,
+        "open_rate": 0.0,
+        "reply_rate": 0.0,
+    }
+
+    if campaign.started_at:
+        stats_result = await db.execute(
+            select(
+                func.count(func.distinct(EmailSequence.lead_id)).label("total_leads"),
+                func.count().filter(EmailSequence.status.in_(["sent", "opened", "replied"])).label("emails_sent"),
+                func.count().filter(EmailSequence.status == "opened").label("emails_opened"),
+                func.count().filter(EmailSequence.status == "replied").label("emails_replied"),
+                func.count().filter(EmailSequence.status == "bounced").label("emails_bounced"),
+            ).where(EmailSequence.campaign_id == campaign_id)
+        )
+        row = stats_result.one()
+        stats.update(row._asdict())
 
-    # TODO: In production, link EmailSequence to Campaign via FK
-    # and use:
-    #   select(func.count(EmailSequence.id), ...)
-    #     .where(EmailSequence.campaign_id == campaign_id)
+        emails_sent = stats["emails_sent"]
+        if emails_sent:
+            stats["open_rate"] = round(stats["emails_opened"] / emails_sent * 100, 2)
+            stats["reply_rate"] = round(stats["emails_replied"] / emails_sent * 100, 2)
 
     return {
         "campaign": CampaignResponse.model_validate(campaign),
-        "stats": {
-            "total_leads": 0,
-            "emails_sent": 0,
-            "emails_opened": 0,
-            "emails_replied": 0,
-            "emails_bounced": 0,
-            "open_rate": 0.0,
-            "reply_rate": 0.0,
-        },
+        "stats": stats,
     }
 
 
@@ -180,17 +212,16 @@ async def update_campaign(campaign_id: int, campaign_data: CampaignUpdate, db: A
 async def delete_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a campaign (only if draft or paused)"""
 
-    result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
-    campaign = result.scalar_one_or_none()
-
-    if not campaign:
-        raise HTTPException(status_code=404, detail=f"Campaign with ID {campaign_id} not found")
+    # Status check and delete in one statement; no row back means missing or active
+    result = await db.execute(
+        delete(Campaign).where(Campaign.id == campaign_id, Campaign.status != "active").returning(Campaign.name)
+    )
+    name = result.scalar_one_or_none()
 
-    if campaign.status == "active":
+    if name is None:
+        await _campaign_status_or_404(db, campaign_id)
         raise HTTPException(status_code=400, detail="Cannot delete active campaign. Pause it first.")
 
-    name = campaign.name
-    await db.delete(campaign)
     await db.commit()
 
     return MessageResponse(message=f"Campaign '{name}' deleted successfully")
@@ -200,14 +231,21 @@ async def delete_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
 # START CAMPAIGN (SEND EMAILS TO LEADS)
 # ============================================
 @router.post("/{campaign_id}/start", response_model=dict)
-async def start_campaign(campaign_id: int, request: CampaignStartRequest, db: AsyncSession = Depends(get_db)):
+async def start_campaign(
+    campaign_id: int,
+    request: CampaignStartRequest,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
     """
     Start a campaign by sending emails to selected leads.
 
     - Provide lead_ids to target
     - Optionally provide email_template_id OR custom subject/body
     - Creates EmailSequence records for tracking
-    - Sends emails (mock in demo, SendGrid in production)
+    - Queues the sends (mock in demo, SendGrid in production) to run after
+      the response, so request time doesn't grow with the number of leads
+    - Returns counts only; page GET /campaigns/{id}/emails for per-lead status
     """
     # Get campaign
     result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
@@ -243,88 +281,122 @@ async def start_campaign(campaign_id: int, request: CampaignStartRequest, db: As
     if not leads:
         raise HTTPException(status_code=400, detail="No valid leads found with provided IDs")
 
-    # Update campaign status
-    campaign.status = "active"
-    campaign.started_at = datetime.utcnow()
-
-    # Store template in campaign
-    campaign.email_template = f"Subject: {subject}\n\n{body}"
-
-    # Process each lead
-    results = {
-        "campaign_id": campaign_id,
-        "total_leads": len(leads),
-        "emails_sent": 0,
-        "emails_failed": 0,
-        "details": [],
-    }
-
-    for lead in leads:
-        # Convert lead to dict for personalization
-        lead_data = {
-            "lead_id": lead.id,
-            "first_name": lead.first_name,
-            "last_name": lead.last_name or "",
-            "email": lead.email,
-            "phone": lead.phone or "",
-            "address": lead.address or "",
-            "property_type": lead.property_type or "",
-            "estimated_value": lead.estimated_value or "",
-        }
-
-        # Personalize subject and body
-        personalized_subject = EmailService.personalize_template(subject, lead_data)
-        personalized_body = EmailService.personalize_template(body, lead_data)
-
-        # Create email sequence record FIRST so we have an ID for tracking
-        email_sequence = EmailSequence(
-            lead_id=lead.id,
-            sequence_day=1,
-            email_subject=personalized_subject,
-            email_body=personalized_body,
-            status="pending",  # Will be updated to "sent" by send_campaign_email()
-        )
-        db.add(email_sequence)
-        await db.flush()  # Gets us the sequence.id without committing the transaction
-
-        # Send email — saves message_id back to the sequence row automatically
-        # This is what makes webhook event tracking work.
-        send_result = await email_service.send_campaign_email(
-            to_email=lead.email,
-            subject=personalized_subject,
-            body=personalized_body,
-            sequence_id=email_sequence.id,  # Links the message_id back to this row
-            db=db,
+    # Activate the campaign and store its template. Guarded on status so a
+    # concurrent start can't activate it twice; RETURNING refreshes `campaign`
+    # in place, so no re-SELECT is needed after commit.
+    result = await db.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id, Campaign.status != "active")
+        .values(
+            status="active",
+            # DB clock, so started_at lines up with the sequences' created_at defaults
+            started_at=func.now(),
+            email_template=f"Subject: {subject}\n\n{body}",
         )
+        .returning(Campaign)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=400, detail="Campaign is already active")
 
-        # Update sequence status if send failed
-        if not send_result.get("success"):
-            email_sequence.status = "bounced"
-            email_sequence.bounce_reason = send_result.get("error", "Send failed")[:255]
-
-        # Update lead status
-        if send_result.get("success"):
-            lead.status = "contacted"
-            results["emails_sent"] += 1
-        else:
-            results["emails_failed"] += 1
-
-        results["details"].append(
+    # Personalize every email up front so the insert payload is ready in one shot.
+    # Subject/body are parsed once; each lead is then a join over the parts.
+    subject_parts = EmailService.compile_template(subject)
+    body_parts = EmailService.compile_template(body)
+    rows = []
+    for lead in leads:
+        email_subject, email_body = EmailService.render_message(subject_parts, body_parts, _lead_template_data(lead))
+        rows.append(
             {
                 "lead_id": lead.id,
-                "email": lead.email,
-                "success": send_result.get("success"),
-                "message_id": send_result.get("message_id"),
-                "error": send_result.get("error"),
+                "campaign_id": campaign.id,
+                "sequence_day": 1,
+                "email_subject": email_subject,
+                "email_body": email_body,
+                "status": "pending",  # Will be updated to "sent" by send_campaign_batch()
             }
         )
 
+    # One multi-row INSERT ... RETURNING id for all leads; delivery happens in the background
+    insert_result = await db.execute(
+        insert(EmailSequence).returning(EmailSequence.id, sort_by_parameter_order=True), rows
+    )
+    sequence_ids = list(insert_result.scalars())
+
     await db.commit()
-    await db.refresh(campaign)
+    dashboard_cache.clear()
+
+    background_tasks.add_task(deliver_campaign_emails, sequence_ids, subject, body)
+
+    return {
+        "campaign_id": campaign_id,
+        "total_leads": len(leads),
+        "emails_queued": len(sequence_ids),
+        "campaign": CampaignResponse.model_validate(campaign).model_dump(),
+    }
+
 
-    results["campaign"] = CampaignResponse.model_validate(campaign).model_dump()
+async def deliver_campaign_emails(sequence_ids: list[int], subject: str, body: str):
+    """
+    Send the queued emails for a started campaign.
 
-    return results
+    Runs after the start response has gone out, on its own session (the
+    request session is closed by then). Recipients go out through
+    send_campaign_batch() — one SendGrid request per 1000 — and each chunk
+    is committed as it completes, so its message ids are stored before
+    SendGrid's webhook events for it can arrive.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(EmailSequence.id, Lead)
+            .join(Lead, EmailSequence.lead_id == Lead.id)
+            .where(EmailSequence.id.in_(sequence_ids), EmailSequence.status == "pending")
+            .order_by(EmailSequence.id)
+        )
+        recipients = [{**_lead_template_data(lead), "sequence_id": sequence_id} for sequence_id, lead in result.all()]
+
+        sent = failed = 0
+        for start in range(0, len(recipients), SENDGRID_MAX_PERSONALIZATIONS):
+            chunk = recipients[start : start + SENDGRID_MAX_PERSONALIZATIONS]
+            lead_ids = {r["sequence_id"]: r["lead_id"] for r in chunk}
+
+            # Saves message ids back to the sequence rows — this is what makes webhook tracking work
+            send_result = await email_service.send_campaign_batch(subject, body, chunk, db=db)
+
+            if send_result["sent"]:
+                await db.execute(
+                    update(Lead)
+                    .where(Lead.id.in_([lead_ids[sid] for sid in send_result["sent"]]))
+                    .values(status="contacted")
+                )
+            if send_result["failed"]:
+                await db.execute(
+                    update(EmailSequence),
+                    [
+                        {"id": sid, "status": "bounced", "bounce_reason": (error or "Send failed")[:255]}
+                        for sid, error in send_result["failed"].items()
+                    ],
+                )
+
+            await db.commit()
+            dashboard_cache.clear()
+            sent += len(send_result["sent"])
+            failed += len(send_result["failed"])
+
+    print(f"📨 Campaign delivery finished: {sent} sent, {failed} failed")
+
+
+def _lead_template_data(lead: Lead) -> dict:
+    """Lead fields available to {{placeholder}} personalization"""
+    return {
+        "lead_id": lead.id,
+        "first_name": lead.first_name,
+        "last_name": lead.last_name or "",
+        "email": lead.email,
+        "phone": lead.phone or "",
+        "address": lead.address or "",
+        "property_type": lead.property_type or "",
+        "estimated_value": lead.estimated_value or "",
+    }
 
 
 # ============================================
@@ -334,18 +406,19 @@ async def start_campaign(campaign_id: int, request: CampaignStartRequest, db: As
 async def pause_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
     """Pause an active campaign"""
 
-    result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
+    result = await db.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id, Campaign.status == "active")
+        .values(status="paused")
+        .returning(Campaign)
+    )
     campaign = result.scalar_one_or_none()
 
     if not campaign:
-        raise HTTPException(status_code=404, detail=f"Campaign with ID {campaign_id} not found")
-
-    if campaign.status != "active":
-        raise HTTPException(status_code=400, detail=f"Campaign is not active (current status: {campaign.status})")
+        status = await _campaign_status_or_404(db, campaign_id)
+        raise HTTPException(status_code=400, detail=f"Campaign is not active (current status: {status})")
 
-    campaign.status = "paused"
     await db.commit()
-    await db.refresh(campaign)
 
     return CampaignResponse.model_validate(campaign)
 
@@ -357,17 +430,18 @@ async def pause_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
 async def complete_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
     """Mark a campaign as completed"""
 
-    result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
+    result = await db.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id)
+        .values(status="completed", ended_at=func.now())
+        .returning(Campaign)
+    )
     campaign = result.scalar_one_or_none()
 
     if not campaign:
         raise HTTPException(status_code=404, detail=f"Campaign with ID {campaign_id} not found")
 
-    campaign.status = "completed"
-    campaign.ended_at = datetime.utcnow()
-
     await db.commit()
-    await db.refresh(campaign)
 
     return CampaignResponse.model_validate(campaign)
 
@@ -379,22 +453,34 @@ async def complete_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)
 async def resume_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
     """Resume a paused campaign"""
 
-    result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
+    result = await db.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id, Campaign.status == "paused")
+        .values(status="active")
+        .returning(Campaign)
+    )
     campaign = result.scalar_one_or_none()
 
     if not campaign:
-        raise HTTPException(status_code=404, detail=f"Campaign with ID {campaign_id} not found")
+        status = await _campaign_status_or_404(db, campaign_id)
+        raise HTTPException(status_code=400, detail=f"Campaign is not paused (current status: {status})")
 
-    if campaign.status != "paused":
-        raise HTTPException(status_code=400, detail=f"Campaign is not paused (current status: {campaign.status})")
-
-    campaign.status = "active"
     await db.commit()
-    await db.refresh(campaign)
 
     return CampaignResponse.model_validate(campaign)
 
 
+async def _campaign_status_or_404(db: AsyncSession, campaign_id: int) -> str:
+    """Current status of a campaign, for error messages after a guarded UPDATE/DELETE matched no row"""
+    result = await db.execute(select(Campaign.status).where(Campaign.id == campaign_id))
+    status = result.scalar_one_or_none()
+
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Campaign with ID {campaign_id} not found")
+
+    return status
+
+
 # ============================================
 # GET CAMPAIGN EMAIL HISTORY
 # ============================================
@@ -403,14 +489,11 @@ async def get_campaign_emails(
     campaign_id: int,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
-    status: str | None = Query(None, pattern="^(pending|scheduled|sent|opened|replied|bounced)$"),
+    status: Literal["pending", "scheduled", "sent", "opened", "replied", "bounced"] | None = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get all emails sent as part of this campaign.
-
-    For demo: Returns emails sent around campaign start time.
-    For production: Would use campaign_id FK in EmailSequence.
     """
     # Verify campaign exists
     result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
@@ -419,12 +502,12 @@ async def get_campaign_emails(
     if not campaign:
         raise HTTPException(status_code=404, detail=f"Campaign with ID {campaign_id} not found")
 
-    # For demo, get emails sent after campaign started
-    # In production, use FK relationship
-    query = select(EmailSequence)
-
-    if campaign.started_at:
-        query = query.where(EmailSequence.created_at >= campaign.started_at)
+    # Lead details come from the same query (join) rather than a second lookup
+    query = (
+        select(EmailSequence, Lead)
+        .join(Lead, EmailSequence.lead_id == Lead.id)
+        .where(EmailSequence.campaign_id == campaign_id)
+    )
 
     if status:
         query = query.where(EmailSequence.status == status)
@@ -434,22 +517,15 @@ async def get_campaign_emails(
     query = query.order_by(EmailSequence.created_at.desc()).offset(offset).limit(per_page)
 
     result = await db.execute(query)
-    sequences = result.scalars().all()
-
-    # Get leads for context
-    lead_ids = [s.lead_id for s in sequences]
-    leads_result = await db.execute(select(Lead).where(Lead.id.in_(lead_ids)))
-    leads_map = {ld.id: ld for ld in leads_result.scalars().all()}
 
     emails = []
-    for seq in sequences:
-        lead = leads_map.get(seq.lead_id)
+    for seq, lead in result.all():
         emails.append(
             {
                 "id": seq.id,
                 "lead_id": seq.lead_id,
-                "lead_name": f"{lead.first_name} {lead.last_name or ''}".strip() if lead else "Unknown",
-                "lead_email": lead.email if lead else "Unknown",
+                "lead_name": f"{lead.first_name} {lead.last_name or ''}".strip(),
+                "lead_email": lead.email,
                 "subject": seq.email_subject,
                 "status": seq.status,
                 "sent_at": seq.sent_at,
@@ -471,41 +547,30 @@ async def get_campaign_emails(
 # ============================================
 @router.post("/quick-start", response_model=dict)
 async def quick_start_campaign(
-    name: str = Query(..., description="Campaign name"),
-    lead_ids: str = Query(..., description="Comma-separated lead IDs"),
-    template_id: int | None = Query(None, description="Email template ID"),
-    subject: str | None = Query(None, description="Custom subject (if no template)"),
-    body: str | None = Query(None, description="Custom body (if no template)"),
+    request: CampaignQuickStartRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Quick start a campaign in one API call.
 
     1. Creates campaign
-    2. Starts sending immediately
-    3. Returns results
+    2. Starts sending immediately (in the background)
+    3. Returns the queued campaign
+
+    JSON body: name, lead_ids (array of ints), and email_template_id
+    OR custom subject/body — the same fields as /{campaign_id}/start.
 
     Perfect for demo/testing!
     """
     # Create campaign
-    campaign = Campaign(name=name, status="draft")
+    campaign = Campaign(name=request.name, status="draft")
     db.add(campaign)
     await db.commit()
     await db.refresh(campaign)
 
-    # Parse lead IDs
-    try:
-        parsed_lead_ids = [int(x.strip()) for x in lead_ids.split(",")]
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid lead_ids format. Use comma-separated integers.")
-
-    # Build start request
-    start_request = CampaignStartRequest(
-        lead_ids=parsed_lead_ids, email_template_id=template_id, subject=subject, body=body
-    )
-
     # Start campaign
-    return await start_campaign(campaign.id, start_request, db)
+    return await start_campaign(campaign.id, request, background_tasks, db)
 
 
 # ============================================
@@ -4,7 +4,8 @@ Endpoints for the AI-powered sales assistant (chatbot)
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -20,6 +21,9 @@ from app.utils.ai_service import ai_service
 
 router = APIRouter()
 
+# Validates a lead's whole history in one call instead of one ChatMessage(...) per row
+_chat_message_list_adapter = TypeAdapter(list[ChatMessage])
+
 
 @router.options("/message")
 async def chatbot_message_options() -> Response:
@@ -124,18 +128,16 @@ async def get_chatbot_history(
     Returns messages ordered from oldest to newest.
     """
     # Ensure lead exists
-    result = await db.execute(select(Lead).where(Lead.id == lead_id))
-    lead = result.scalar_one_or_none()
-
-    if not lead:
+    if not await db.scalar(select(exists().where(Lead.id == lead_id))):
         raise HTTPException(status_code=404, detail=f"Lead {lead_id} not found")
 
-    # Fetch messages
+    # Fetch messages (only the two columns the response uses, no ORM objects)
     msg_result = await db.execute(
-        select(ChatbotMessage).where(ChatbotMessage.lead_id == lead_id).order_by(ChatbotMessage.created_at.asc())
+        select(ChatbotMessage.role, ChatbotMessage.content)
+        .where(ChatbotMessage.lead_id == lead_id)
+        .order_by(ChatbotMessage.created_at.asc())
     )
-    rows = msg_result.scalars().all()
 
-    messages = [ChatMessage(role=row.role, content=row.content) for row in rows]
+    messages = _chat_message_list_adapter.validate_python(msg_result.all(), from_attributes=True)
 
     return ChatbotHistoryResponse(lead_id=lead_id, messages=messages)
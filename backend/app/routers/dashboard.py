@@ -3,16 +3,18 @@ Dashboard Router
 Endpoints for dashboard statistics and analytics
 """
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import and_, func, select
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import DateTime, String, and_, cast, func, literal, null, select, text, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.models import Booking, Campaign, EmailSequence, Lead, Reply, SmsMessage, VoiceCall
 from app.schemas import DashboardLeadFunnel, DashboardRecentActivity, DashboardResponse, DashboardStats, WeeklyInsightsResponse
 from app.utils.ai_service import generate_weekly_insights
+from app.utils.cache import dashboard_cache
 
 router = APIRouter()
 
@@ -21,17 +23,38 @@ router = APIRouter()
 # MAIN DASHBOARD
 # ============================================
 @router.get("", response_model=DashboardResponse)
-async def get_dashboard(db: AsyncSession = Depends(get_db)):
+async def get_dashboard():
     """
     Get complete dashboard with stats, funnel, and recent activity.
 
     This is the main endpoint for the dashboard view.
+    The three sections are independent, so they are queried concurrently.
+    Responses are reused for DASHBOARD_CACHE_TTL seconds; writes that
+    change the numbers clear the cache (see app.utils.cache).
     """
-    stats = await get_stats(db)
-    funnel = await get_funnel(db)
-    activity = await get_recent_activity(db)
+    cached = dashboard_cache.get("dashboard")
+    if cached is not None:
+        return cached
+
+    stats, funnel, activity = await asyncio.gather(
+        _in_session(get_stats),
+        _in_session(get_funnel),
+        get_recent_activity(),
+    )
+
+    response = DashboardResponse(stats=stats, funnel=funnel, recent_activity=activity)
+    dashboard_cache.set("dashboard", response)
+    return response
 
-    return DashboardResponse(stats=stats, funnel=funnel, recent_activity=activity)
+
+async def _in_session(query_fn, *args):
+    """
+    Run query_fn(session, *args) on its own session.
+    An AsyncSession can't run statements concurrently, so each coroutine
+    passed to asyncio.gather needs a session (and pooled connection) of its own.
+    """
+    async with AsyncSessionLocal() as session:
+        return await query_fn(session, *args)
 
 
 # ============================================
@@ -45,85 +68,78 @@ async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
 
 async def get_stats(db: AsyncSession) -> DashboardStats:
     """Calculate all dashboard statistics"""
-    # HELLO WORLD
-    # Time boundaries
-    now = datetime.utcnow().replace(tzinfo=UTC)
+    # Time boundaries: one snapshot shared by every query below. They go out as
+    # bound parameters, so each statement's compiled form is reused from
+    # SQLAlchemy's cache across calls regardless of the current time.
+    now = datetime.now(UTC)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today_start - timedelta(days=today_start.weekday())
 
-    # ---- LEADS ----S
-    total_leads_result = await db.execute(select(func.count(Lead.id)))
-    total_leads = total_leads_result.scalar() or 0
+    # One aggregate query per table; each counter is a COUNT(*) FILTER (...) so
+    # Postgres computes them all in a single pass.
+    sent_statuses = ["sent", "opened", "replied"]
 
-    # Leads by status
-    leads_by_status_query = select(Lead.status, func.count(Lead.id)).group_by(Lead.status)
-    leads_status_result = await db.execute(leads_by_status_query)
-    leads_by_status = {row[0]: row[1] for row in leads_status_result.fetchall()}
+    # ---- LEADS ----
+    # total = sum of the per-status counts
+    leads_status_result = await db.execute(select(Lead.status, func.count(Lead.id)).group_by(Lead.status))
+    leads_by_status = {status: count for status, count in leads_status_result}
+    total_leads = sum(leads_by_status.values())
 
     # ---- EMAILS ----
-    total_emails_result = await db.execute(select(func.count(EmailSequence.id)))
-    total_emails_sent = total_emails_result.scalar() or 0
-
-    # Emails by status
-    emails_opened_result = await db.execute(
-        select(func.count(EmailSequence.id)).where(EmailSequence.status == "opened")
-    )
-    emails_opened = emails_opened_result.scalar() or 0
-
-    emails_replied_result = await db.execute(
-        select(func.count(EmailSequence.id)).where(EmailSequence.status == "replied")
-    )
-    emails_replied = emails_replied_result.scalar() or 0
-
-    emails_bounced_result = await db.execute(
-        select(func.count(EmailSequence.id)).where(EmailSequence.status == "bounced")
+    emails_result = await db.execute(
+        select(
+            func.count(EmailSequence.id).label("total"),
+            func.count().filter(EmailSequence.status == "opened").label("opened"),
+            func.count().filter(EmailSequence.status == "replied").label("replied"),
+            func.count().filter(EmailSequence.status == "bounced").label("bounced"),
+            func.count()
+            .filter(and_(EmailSequence.sent_at >= today_start, EmailSequence.status.in_(sent_statuses)))
+            .label("sent_today"),
+            func.count()
+            .filter(and_(EmailSequence.sent_at >= week_start, EmailSequence.status.in_(sent_statuses)))
+            .label("sent_this_week"),
+        )
     )
-    emails_bounced = emails_bounced_result.scalar() or 0
+    emails = emails_result.one()
+    total_emails_sent = emails.total
+    emails_opened = emails.opened
+    emails_replied = emails.replied
+    emails_bounced = emails.bounced
+    emails_sent_today = emails.sent_today
+    emails_sent_this_week = emails.sent_this_week
 
     # Calculate rates
     open_rate = (emails_opened / total_emails_sent * 100) if total_emails_sent > 0 else 0.0
     reply_rate = (emails_replied / total_emails_sent * 100) if total_emails_sent > 0 else 0.0
 
     # ---- REPLIES ----
-    total_replies_result = await db.execute(select(func.count(Reply.id)))
-    total_replies = total_replies_result.scalar() or 0
-
-    # Replies by sentiment
-    replies_by_sentiment_query = select(Reply.sentiment, func.count(Reply.id)).group_by(Reply.sentiment)
-    replies_sentiment_result = await db.execute(replies_by_sentiment_query)
-    replies_by_sentiment = {row[0] or "unprocessed": row[1] for row in replies_sentiment_result.fetchall()}
-
-    # ---- BOOKINGS ----
-    total_bookings_result = await db.execute(select(func.count(Booking.id)))
-    total_bookings = total_bookings_result.scalar() or 0
-
-    upcoming_bookings_result = await db.execute(select(func.count(Booking.id)).where(Booking.scheduled_time >= now))
-    upcoming_bookings = upcoming_bookings_result.scalar() or 0
-
-    # ---- TIME-BASED METRICS ----
-    # Emails sent today
-    emails_today_result = await db.execute(
-        select(func.count(EmailSequence.id)).where(
-            and_(EmailSequence.sent_at >= today_start, EmailSequence.status.in_(["sent", "opened", "replied"]))
-        )
+    # Per-sentiment counts (plus today's share); totals are their sums
+    replies_result = await db.execute(
+        select(
+            Reply.sentiment,
+            func.count(Reply.id),
+            func.count().filter(Reply.created_at >= today_start),
+        ).group_by(Reply.sentiment)
     )
-    emails_sent_today = emails_today_result.scalar() or 0
+    replies_by_sentiment = {}
+    replies_today = 0
+    for sentiment, count, today_count in replies_result:
+        replies_by_sentiment[sentiment or "unprocessed"] = count
+        replies_today += today_count
+    total_replies = sum(replies_by_sentiment.values())
 
-    # Emails sent this week
-    emails_week_result = await db.execute(
-        select(func.count(EmailSequence.id)).where(
-            and_(EmailSequence.sent_at >= week_start, EmailSequence.status.in_(["sent", "opened", "replied"]))
+    # ---- BOOKINGS ----
+    bookings_result = await db.execute(
+        select(
+            func.count(Booking.id).label("total"),
+            func.count().filter(Booking.scheduled_time >= now).label("upcoming"),
+            func.count().filter(Booking.scheduled_time >= week_start).label("this_week"),
         )
     )
-    emails_sent_this_week = emails_week_result.scalar() or 0
-
-    # Replies today
-    replies_today_result = await db.execute(select(func.count(Reply.id)).where(Reply.created_at >= today_start))
-    replies_today = replies_today_result.scalar() or 0
-
-    # Bookings this week
-    bookings_week_result = await db.execute(select(func.count(Booking.id)).where(Booking.scheduled_time >= week_start))
-    bookings_this_week = bookings_week_result.scalar() or 0
+    bookings = bookings_result.one()
+    total_bookings = bookings.total
+    upcoming_bookings = bookings.upcoming
+    bookings_this_week = bookings.this_week
 
     return DashboardStats(
         total_leads=total_leads,
@@ -158,11 +174,13 @@ async def get_funnel(db: AsyncSession) -> DashboardLeadFunnel:
     """Calculate lead funnel counts"""
 
     statuses = ["uploaded", "contacted", "replied", "interested", "booked", "closed"]
-    funnel_data = {}
 
-    for status in statuses:
-        result = await db.execute(select(func.count(Lead.id)).where(Lead.status == status))
-        funnel_data[status] = result.scalar() or 0
+    # One GROUP BY over idx_leads_status instead of a COUNT per status
+    result = await db.execute(
+        select(Lead.status, func.count(Lead.id)).where(Lead.status.in_(statuses)).group_by(Lead.status)
+    )
+    funnel_data = dict.fromkeys(statuses, 0)
+    funnel_data.update(result.tuples().all())
 
     return DashboardLeadFunnel(**funnel_data)
 
@@ -171,77 +189,103 @@ async def get_funnel(db: AsyncSession) -> DashboardLeadFunnel:
 # RECENT ACTIVITY
 # ============================================
 @router.get("/activity", response_model=list)
-async def get_dashboard_activity(limit: int = 20, db: AsyncSession = Depends(get_db)):
+async def get_dashboard_activity(limit: int = 20):
     """Get recent activity feed"""
-    return await get_recent_activity(db, limit)
+    return await get_recent_activity(limit)
 
 
-async def get_recent_activity(db: AsyncSession, limit: int = 10) -> list:
+async def get_recent_activity(limit: int = 10) -> list:
     """Get recent activity across all entities"""
+    # Own session, so the dashboard can run it alongside the other sections
+    return await _in_session(_recent_activity, limit)
 
-    activities = []
 
-    # Recent emails sent
-    emails_result = await db.execute(
-        select(EmailSequence, Lead)
+# "First Last" built by Postgres in the activity queries (NULL/empty parts are skipped)
+_lead_name = func.concat_ws(" ", func.nullif(Lead.first_name, ""), func.nullif(Lead.last_name, "")).label("lead_name")
+
+
+async def _recent_activity(db: AsyncSession, limit: int) -> list[DashboardRecentActivity]:
+    """
+    Latest sent emails, received replies and created bookings, newest first.
+
+    One UNION ALL: each branch takes its own newest `limit` rows (so it can walk
+    its timestamp index), and Postgres merges them and keeps the top `limit`.
+    Columns: type, lead_id, lead_name, detail (subject / sentiment),
+    scheduled_time (bookings only), timestamp.
+    """
+    no_detail = cast(null(), String).label("detail")
+    no_schedule = cast(null(), DateTime(timezone=True)).label("scheduled_time")
+
+    emails = (
+        select(
+            literal("email_sent").label("type"),
+            EmailSequence.lead_id,
+            _lead_name,
+            EmailSequence.email_subject.label("detail"),
+            no_schedule,
+            EmailSequence.sent_at.label("timestamp"),
+        )
         .join(Lead, EmailSequence.lead_id == Lead.id)
         .where(EmailSequence.sent_at.isnot(None))
         .order_by(EmailSequence.sent_at.desc())
         .limit(limit)
     )
-
-    for seq, lead in emails_result.fetchall():
-        activities.append(
-            DashboardRecentActivity(
-                type="email_sent",
-                lead_id=lead.id,
-                lead_name=f"{lead.first_name} {lead.last_name or ''}".strip(),
-                description=(
-                    f"Email sent: {seq.email_subject[:50]}..."
-                    if seq.email_subject and len(seq.email_subject) > 50
-                    else f"Email sent: {seq.email_subject or 'No subject'}"
-                ),
-                timestamp=seq.sent_at,
-            )
+    replies = (
+        select(
+            literal("reply_received").label("type"),
+            Reply.lead_id,
+            _lead_name,
+            Reply.sentiment.label("detail"),
+            no_schedule,
+            Reply.created_at.label("timestamp"),
         )
-
-    # Recent replies
-    replies_result = await db.execute(
-        select(Reply, Lead).join(Lead, Reply.lead_id == Lead.id).order_by(Reply.created_at.desc()).limit(limit)
+        .join(Lead, Reply.lead_id == Lead.id)
+        .order_by(Reply.created_at.desc())
+        .limit(limit)
     )
-
-    for reply, lead in replies_result.fetchall():
-        sentiment_text = f" ({reply.sentiment})" if reply.sentiment else ""
-        activities.append(
-            DashboardRecentActivity(
-                type="reply_received",
-                lead_id=lead.id,
-                lead_name=f"{lead.first_name} {lead.last_name or ''}".strip(),
-                description=f"Reply received{sentiment_text}",
-                timestamp=reply.created_at,
-            )
+    bookings = (
+        select(
+            literal("booking_created").label("type"),
+            Booking.lead_id,
+            _lead_name,
+            no_detail,
+            Booking.scheduled_time,
+            Booking.created_at.label("timestamp"),
         )
-
-    # Recent bookings
-    bookings_result = await db.execute(
-        select(Booking, Lead).join(Lead, Booking.lead_id == Lead.id).order_by(Booking.created_at.desc()).limit(limit)
+        .join(Lead, Booking.lead_id == Lead.id)
+        .order_by(Booking.created_at.desc())
+        .limit(limit)
     )
 
-    for booking, lead in bookings_result.fetchall():
-        time_str = booking.scheduled_time.strftime("%b %d at %I:%M %p")
-        activities.append(
-            DashboardRecentActivity(
-                type="booking_created",
-                lead_id=lead.id,
-                lead_name=f"{lead.first_name} {lead.last_name or ''}".strip(),
-                description=f"Meeting scheduled for {time_str}",
-                timestamp=booking.created_at,
-            )
+    activity = union_all(emails, replies, bookings).subquery()
+    result = await db.execute(select(activity).order_by(activity.c.timestamp.desc()).limit(limit))
+
+    return [
+        DashboardRecentActivity(
+            type=row.type,
+            lead_id=row.lead_id,
+            lead_name=row.lead_name,
+            description=_activity_description(row),
+            timestamp=row.timestamp,
         )
+        for row in result
+    ]
+
+
+def _activity_description(row) -> str:
+    """Feed text for one _recent_activity() row"""
+    if row.type == "email_sent":
+        subject = row.detail
+        if subject and len(subject) > 50:
+            return f"Email sent: {subject[:50]}..."
+        return f"Email sent: {subject or 'No subject'}"
 
-    # Sort all activities by timestamp and limit
-    activities.sort(key=lambda x: x.timestamp, reverse=True)
-    return activities[:limit]
+    if row.type == "reply_received":
+        sentiment_text = f" ({row.detail})" if row.detail else ""
+        return f"Reply received{sentiment_text}"
+
+    time_str = row.scheduled_time.strftime("%b %d at %I:%M %p")
+    return f"Meeting scheduled for {time_str}"
 
 
 # ============================================
@@ -255,7 +299,7 @@ async def get_campaigns_overview(db: AsyncSession = Depends(get_db)):
     campaigns_query = select(Campaign.status, func.count(Campaign.id)).group_by(Campaign.status)
 
     result = await db.execute(campaigns_query)
-    by_status = {row[0]: row[1] for row in result.fetchall()}
+    by_status = {status: count for status, count in result}
 
     # Get active campaigns
     active_result = await db.execute(
@@ -273,23 +317,47 @@ async def get_campaigns_overview(db: AsyncSession = Depends(get_db)):
 # QUICK STATS (LIGHTWEIGHT)
 # ============================================
 @router.get("/quick", response_model=dict)
-async def get_quick_stats(db: AsyncSession = Depends(get_db)):
+async def get_quick_stats(
+    exact: bool = Query(True, description="False = planner row estimates (instant, approximate)"),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Lightweight endpoint for quick stats refresh.
 
-    Returns only essential counts for fast loading.
+    Returns only essential counts for fast loading, all in one round-trip.
+    With exact=false the counts come from pg_class.reltuples instead of
+    scanning each table — approximate (as of the last VACUUM/ANALYZE) but constant-time.
     """
-    leads = await db.execute(select(func.count(Lead.id)))
-    emails = await db.execute(select(func.count(EmailSequence.id)))
-    replies = await db.execute(select(func.count(Reply.id)))
-    bookings = await db.execute(select(func.count(Booking.id)))
-
-    return {
-        "leads": leads.scalar() or 0,
-        "emails_sent": emails.scalar() or 0,
-        "replies": replies.scalar() or 0,
-        "bookings": bookings.scalar() or 0,
-    }
+    if not exact:
+        return await _estimated_counts(db)
+
+    result = await db.execute(_QUICK_COUNTS_SQL)
+    return dict(result.one()._mapping)
+
+
+# Response key -> table counted for it
+_QUICK_STATS_TABLES = {
+    "leads": Lead.__tablename__,
+    "emails_sent": EmailSequence.__tablename__,
+    "replies": Reply.__tablename__,
+    "bookings": Booking.__tablename__,
+}
+
+# Fixed SQL built once at import: all four counts in one row, nothing to compile per request
+_QUICK_COUNTS_SQL = text(
+    "SELECT " + ", ".join(f"(SELECT count(*) FROM {table}) AS {key}" for key, table in _QUICK_STATS_TABLES.items())
+)
+
+_ESTIMATED_COUNTS_SQL = text(
+    "SELECT relname, greatest(reltuples, 0)::bigint FROM pg_class WHERE oid = ANY(CAST(:tables AS regclass[]))"
+)
+
+
+async def _estimated_counts(db: AsyncSession) -> dict:
+    """Planner row estimates for the quick-stats tables (-1 = never analyzed, reported as 0)"""
+    result = await db.execute(_ESTIMATED_COUNTS_SQL, {"tables": list(_QUICK_STATS_TABLES.values())})
+    estimates = dict(result.all())
+    return {key: estimates.get(table, 0) for key, table in _QUICK_STATS_TABLES.items()}
 
 
 # ============================================
@@ -303,7 +371,7 @@ async def get_weekly_insights(db: AsyncSession = Depends(get_db)):
     The LLM analyzes the last 7 days of engagement data and produces a
     plain-English summary with highlights and actionable recommendations.
     """
-    now = datetime.utcnow().replace(tzinfo=UTC)
+    now = datetime.now(UTC)
     week_ago = now - timedelta(days=7)
     two_weeks_ago = now - timedelta(days=14)
 
@@ -373,7 +441,11 @@ async def get_weekly_insights(db: AsyncSession = Depends(get_db)):
     # Top campaign (most emails in the period)
     top_campaign_res = await db.execute(
         select(Campaign.name, func.count(EmailSequence.id).label("cnt"))
-        .join(EmailSequence, EmailSequence.created_at >= week_ago, isouter=True)
+        .join(
+            EmailSequence,
+            and_(EmailSequence.campaign_id == Campaign.id, EmailSequence.created_at >= week_ago),
+            isouter=True,
+        )
         .group_by(Campaign.name)
         .order_by(func.count(EmailSequence.id).desc())
         .limit(1)
@@ -4,19 +4,32 @@ Endpoints for simulating events during demos (open, reply, booking)
 These endpoints are for DEMO/TESTING purposes only.
 """
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import delete, func, select
+from sqlalchemy import exists, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import Booking, Campaign, EmailSequence, EmailTemplate, Lead, Reply
+from app.utils.cache import dashboard_cache
 
 router = APIRouter()
 
 
+# Canned reply body for each simulated sentiment (also the set of valid sentiments)
+SIMULATED_REPLY_TEXTS = {
+    "interested": "Yes, I'm interested! When can we schedule a call?",
+    "not_now": "Thanks for reaching out, but now isn't a good time. Maybe later.",
+    "unsubscribe": "Please remove me from your mailing list.",
+    "other": "Thanks for the email. I have some questions.",
+}
+
+# Lead status a simulated reply moves the lead to
+REPLY_SENTIMENT_STATUS = {"interested": "interested", "not_now": "replied", "unsubscribe": "closed", "other": "replied"}
+
+
 # ============================================
 # REQUEST SCHEMAS
 # ============================================
@@ -68,10 +81,11 @@ async def simulate_email_open(request: SimulateOpenRequest, db: AsyncSession = D
         )
 
     # Update sequence
-    sequence.opened_at = datetime.utcnow()
+    sequence.opened_at = datetime.now(UTC)
     sequence.status = "opened"
 
     await db.commit()
+    dashboard_cache.clear()
 
     return {
         "success": True,
@@ -92,9 +106,8 @@ async def simulate_email_reply(request: SimulateReplyRequest, db: AsyncSession =
     Creates a Reply record and updates lead status.
     """
     # Validate sentiment
-    valid_sentiments = ["interested", "not_now", "unsubscribe", "other"]
-    if request.sentiment not in valid_sentiments:
-        raise HTTPException(status_code=400, detail=f"Invalid sentiment. Must be one of: {valid_sentiments}")
+    if request.sentiment not in SIMULATED_REPLY_TEXTS:
+        raise HTTPException(status_code=400, detail=f"Invalid sentiment. Must be one of: {list(SIMULATED_REPLY_TEXTS)}")
 
     # Get lead
     lead_result = await db.execute(select(Lead).where(Lead.id == request.lead_id))
@@ -114,35 +127,28 @@ async def simulate_email_reply(request: SimulateReplyRequest, db: AsyncSession =
 
     # Update sequence if exists
     if sequence:
-        sequence.replied_at = datetime.utcnow()
+        sequence.replied_at = datetime.now(UTC)
         sequence.status = "replied"
 
     # Create reply record
-    reply_texts = {
-        "interested": "Yes, I'm interested! When can we schedule a call?",
-        "not_now": "Thanks for reaching out, but now isn't a good time. Maybe later.",
-        "unsubscribe": "Please remove me from your mailing list.",
-        "other": "Thanks for the email. I have some questions.",
-    }
-
     reply = Reply(
         lead_id=lead.id,
         email_from=lead.email,
         email_subject=f"Re: {sequence.email_subject if sequence else 'Your email'}",
-        email_body=request.reply_text or reply_texts.get(request.sentiment, "Thanks for the email."),
+        email_body=request.reply_text or SIMULATED_REPLY_TEXTS[request.sentiment],
         sentiment=request.sentiment,
         confidence_score=0.95,  # High confidence for simulated replies
         ai_model_used="demo_simulation",
-        received_at=datetime.utcnow(),
-        processed_at=datetime.utcnow(),
+        received_at=datetime.now(UTC),
+        processed_at=datetime.now(UTC),
     )
     db.add(reply)
 
     # Update lead status based on sentiment
-    status_map = {"interested": "interested", "not_now": "replied", "unsubscribe": "closed", "other": "replied"}
-    lead.status = status_map.get(request.sentiment, "replied")
+    lead.status = REPLY_SENTIMENT_STATUS[request.sentiment]
 
     await db.commit()
+    dashboard_cache.clear()
     await db.refresh(reply)
 
     return {
@@ -172,14 +178,14 @@ async def simulate_booking(request: SimulateBookingRequest, db: AsyncSession = D
         raise HTTPException(status_code=404, detail=f"Lead {request.lead_id} not found")
 
     # Calculate scheduled time
-    scheduled_time = datetime.utcnow() + timedelta(days=request.days_from_now)
+    scheduled_time = datetime.now(UTC) + timedelta(days=request.days_from_now)
     # Round to nearest hour at 2 PM
     scheduled_time = scheduled_time.replace(hour=14, minute=0, second=0, microsecond=0)
 
     # Create booking
     booking = Booking(
         lead_id=lead.id,
-        calendly_event_id=f"demo_evt_{lead.id}_{int(datetime.utcnow().timestamp())}",
+        calendly_event_id=f"demo_evt_{lead.id}_{int(datetime.now(UTC).timestamp())}",
         event_uri=f"https://calendly.com/demo/event/{lead.id}",
         scheduled_time=scheduled_time,
         calendly_invitee_email=lead.email,
@@ -191,6 +197,7 @@ async def simulate_booking(request: SimulateBookingRequest, db: AsyncSession = D
     lead.status = "booked"
 
     await db.commit()
+    dashboard_cache.clear()
     await db.refresh(booking)
 
     return {
@@ -221,15 +228,19 @@ async def reset_demo_data(
         raise HTTPException(status_code=400, detail="This will delete ALL data. Add ?confirm=true to proceed.")
 
     try:
-        # Delete in correct order (respect foreign keys)
-        await db.execute(delete(Booking))
-        await db.execute(delete(Reply))
-        await db.execute(delete(EmailSequence))
-        await db.execute(delete(Lead))
-        await db.execute(delete(Campaign))
-        await db.execute(delete(EmailTemplate))
+        # One TRUNCATE instead of a DELETE per table: frees the pages directly rather
+        # than removing rows one by one. CASCADE also empties the tables that hang off
+        # leads/campaigns (SMS, calls, chatbot, AI scores, variations), which their
+        # ON DELETE CASCADE foreign keys already did; RESTART IDENTITY restarts ids at 1.
+        await db.execute(
+            text(
+                "TRUNCATE bookings, replies, email_sequences, leads, campaigns, email_templates "
+                "RESTART IDENTITY CASCADE"
+            )
+        )
 
         await db.commit()
+        dashboard_cache.clear()
 
         return {"success": True, "message": "All demo data has been reset. Upload new leads to start fresh."}
     except Exception as e:
@@ -247,62 +258,61 @@ async def seed_demo_data(db: AsyncSession = Depends(get_db)):
     Creates sample leads, templates, and a campaign.
     """
     # Check if data already exists
-    existing_leads = await db.execute(select(func.count()).select_from(Lead))
-    if existing_leads.scalar() > 0:
+    if await db.scalar(select(exists().select_from(Lead))):
         raise HTTPException(status_code=400, detail="Data already exists. Use /reset?confirm=true first to clear data.")
 
     try:
         # Create sample leads
         sample_leads = [
-            Lead(
-                email="john.smith@example.com",
-                first_name="John",
-                last_name="Smith",
-                address="123 Oak Street, Miami FL",
-                property_type="Single Family",
-                estimated_value="$450,000",
-                status="uploaded",
-            ),
-            Lead(
-                email="sarah.jones@example.com",
-                first_name="Sarah",
-                last_name="Jones",
-                address="456 Palm Ave, Fort Lauderdale FL",
-                property_type="Condo",
-                estimated_value="$320,000",
-                status="uploaded",
-            ),
-            Lead(
-                email="mike.wilson@example.com",
-                first_name="Mike",
-                last_name="Wilson",
-                address="789 Beach Blvd, Miami Beach FL",
-                property_type="Townhouse",
-                estimated_value="$580,000",
-                status="uploaded",
-            ),
-            Lead(
-                email="emma.davis@example.com",
-                first_name="Emma",
-                last_name="Davis",
-                address="321 Sunset Dr, Coral Gables FL",
-                property_type="Single Family",
-                estimated_value="$720,000",
-                status="uploaded",
-            ),
-            Lead(
-                email="david.brown@example.com",
-                first_name="David",
-                last_name="Brown",
-                address="654 Ocean View, Key Biscayne FL",
-                property_type="Condo",
-                estimated_value="$890,000",
-                status="uploaded",
-            ),
+            {
+                "email": "john.smith@example.com",
+                "first_name": "John",
+                "last_name": "Smith",
+                "address": "123 Oak Street, Miami FL",
+                "property_type": "Single Family",
+                "estimated_value": "$450,000",
+                "status": "uploaded",
+            },
+            {
+                "email": "sarah.jones@example.com",
+                "first_name": "Sarah",
+                "last_name": "Jones",
+                "address": "456 Palm Ave, Fort Lauderdale FL",
+                "property_type": "Condo",
+                "estimated_value": "$320,000",
+                "status": "uploaded",
+            },
+            {
+                "email": "mike.wilson@example.com",
+                "first_name": "Mike",
+                "last_name": "Wilson",
+                "address": "789 Beach Blvd, Miami Beach FL",
+                "property_type": "Townhouse",
+                "estimated_value": "$580,000",
+                "status": "uploaded",
+            },
+            {
+                "email": "emma.davis@example.com",
+                "first_name": "Emma",
+                "last_name": "Davis",
+                "address": "321 Sunset Dr, Coral Gables FL",
+                "property_type": "Single Family",
+                "estimated_value": "$720,000",
+                "status": "uploaded",
+            },
+            {
+                "email": "david.brown@example.com",
+                "first_name": "David",
+                "last_name": "Brown",
+                "address": "654 Ocean View, Key Biscayne FL",
+                "property_type": "Condo",
+                "estimated_value": "$890,000",
+                "status": "uploaded",
+            },
         ]
 
-        for lead in sample_leads:
-            db.add(lead)
+        # One executemany INSERT (insertmanyvalues) instead of an ORM flush per object
+        await db.execute(insert(Lead), sample_leads)
 
         # Create default template
         template = EmailTemplate(
@@ -329,6 +339,7 @@ Your Real Estate Team""",
         db.add(campaign)
 
         await db.commit()
+        dashboard_cache.clear()
 
         return {
             "success": True,
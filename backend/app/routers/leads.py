@@ -3,17 +3,26 @@ Leads Router
 Endpoints for managing leads (contacts/sellers)
 """
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from sqlalchemy import func, select
+import asyncio
+import os
+import shutil
+import tempfile
+from typing import BinaryIO
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Response, UploadFile
+from pydantic import TypeAdapter
+from sqlalchemy import Text, cast, delete, exists, func, literal_column, select, text, true, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.models import AiLeadScore, Campaign, Lead
+from app.database import AsyncSessionLocal, get_db
+from app.models import AiLeadScore, Booking, Campaign, EmailSequence, Lead, LeadImportJob, Reply
 from app.schemas import (
     AiLeadScoreResponse,
     CSVUploadResponse,
     LeadCreate,
+    LeadImportJobResponse,
     LeadListResponse,
     LeadResponse,
     LeadScoreBulkRequest,
@@ -26,9 +35,31 @@ from app.schemas import (
 )
 from app.utils.ai_service import score_lead
 from app.utils.csv_parser import CSVParser
+from app.utils.pagination import fetch_page
 
 router = APIRouter()
 
+# Lead columns a CSV import can fill (status is always "uploaded")
+LEAD_IMPORT_FIELDS = (
+    "email",
+    "first_name",
+    "last_name",
+    "company",
+    "phone",
+    "address",
+    "property_type",
+    "estimated_value",
+)
+
+# Validates a whole page of ORM rows in one call instead of one model_validate per row
+_lead_list_adapter = TypeAdapter(list[LeadResponse])
+
+# Error messages listed in an import summary; any beyond this are only counted (errors_truncated)
+MAX_REPORTED_ERRORS = 1000
+
+# Imports with at least this many new leads are loaded with COPY instead of a multi-row INSERT
+COPY_THRESHOLD = 100
+
 
 # ============================================
 # STEP 1: CSV UPLOAD ENDPOINT
@@ -53,61 +84,189 @@ async def upload_leads_csv(
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="File must be a CSV file")
 
-    # Read file content
-    content = await file.read()
-
-    # Parse CSV
-    valid_leads, errors = CSVParser.parse(content)
-
-    if not valid_leads and errors:
-        return CSVUploadResponse(
-            filename=file.filename,
-            total_rows=0,
-            valid_rows=0,
-            invalid_rows=len(errors),
-            duplicates=0,
-            created=0,
-            errors=errors,
-        )
+    summary = await _import_leads(db, file.file)
+    return CSVUploadResponse(filename=file.filename, **summary)
+
+
+@router.post("/import", response_model=LeadImportJobResponse, status_code=202)
+async def start_lead_import(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV file with leads"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Queue a CSV import and return immediately.
+
+    Same columns and rules as /upload, but the rows are parsed and inserted in
+    a background task. Poll GET /import/{job_id} for the result.
+    """
+    if not file.filename.endswith(".csv"):
+        raise HTTPException(status_code=400, detail="File must be a CSV file")
+
+    # The upload is closed once the response is sent, so keep a copy for the task
+    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
+        await asyncio.to_thread(shutil.copyfileobj, file.file, tmp)
+
+    job = LeadImportJob(filename=file.filename, status="pending")
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    background_tasks.add_task(run_lead_import, job.id, tmp.name)
+    print(f"📥 Queued CSV import {job.id} ({file.filename})")
+
+    return job
+
+
+@router.get("/import/{job_id}", response_model=LeadImportJobResponse)
+async def get_lead_import(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Get the status (and, once finished, the counts) of a CSV import"""
+    job = await db.get(LeadImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+async def run_lead_import(job_id: int, path: str):
+    """
+    Background task: import the saved CSV for a queued job and record the outcome.
+    Uses its own session since the request's session is closed by then.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            await db.execute(update(LeadImportJob).where(LeadImportJob.id == job_id).values(status="running"))
+            await db.commit()
+
+            csv_file = await asyncio.to_thread(open, path, "rb")
+            with csv_file:
+                summary = await _import_leads(db, csv_file)
+
+            await db.execute(
+                update(LeadImportJob)
+                .where(LeadImportJob.id == job_id)
+                .values(status="completed", finished_at=func.now(), **summary)
+            )
+            await db.commit()
+            print(f"✅ CSV import {job_id} done: {summary['created']} created")
+        except Exception as e:
+            print(f"❌ CSV import {job_id} failed: {e}")
+            await db.rollback()
+            await db.execute(
+                update(LeadImportJob)
+                .where(LeadImportJob.id == job_id)
+                .values(status="failed", finished_at=func.now(), errors=[f"Import failed: {e}"])
+            )
+            await db.commit()
+        finally:
+            os.remove(path)
+
 
-    # Insert leads into database
+async def _import_leads(db: AsyncSession, file: BinaryIO) -> dict:
+    """
+    Import a CSV file and return its summary counts (see _upload_summary).
+
+    The file is parsed and imported chunk by chunk, committing each chunk, so
+    memory stays bounded for large files. Parsing runs in a worker thread since
+    it reads (possibly disk-backed) file data. Only the first
+    MAX_REPORTED_ERRORS error messages are kept; the rest are just counted.
+    """
+    chunks = CSVParser.parse_stream(file)
+    valid_rows = 0
     created = 0
-    duplicates = 0
+    errors = []
+    error_count = 0
+
+    while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+        valid_leads, chunk_errors = chunk
+        error_count += len(chunk_errors)
+        errors.extend(chunk_errors[: MAX_REPORTED_ERRORS - len(errors)])
+        if valid_leads:
+            valid_rows += len(valid_leads)
+            created += await _insert_leads(db, valid_leads)
+            await db.commit()
+
+    return _upload_summary(valid_rows, created, errors, error_count)
+
+
+def _upload_summary(valid_rows: int, created: int, errors: list[str], error_count: int) -> dict:
+    """Counts reported for a finished import (shared by /upload and import jobs)"""
+    if not valid_rows and error_count:
+        return {
+            "total_rows": 0,
+            "valid_rows": 0,
+            "invalid_rows": error_count,
+            "duplicates": 0,
+            "created": 0,
+            "errors": errors,
+            "errors_truncated": error_count - len(errors),
+        }
+
+    return {
+        "total_rows": valid_rows + error_count,
+        "valid_rows": valid_rows,
+        "invalid_rows": error_count,
+        "duplicates": valid_rows - created,
+        "created": created,
+        "errors": errors,
+        "errors_truncated": error_count - len(errors),
+    }
+
 
+async def _insert_leads(db: AsyncSession, valid_leads: list[dict]) -> int:
+    """
+    Insert one chunk of parsed leads and return how many were created.
+
+    Emails already stored in any letter case (including ones from earlier chunks
+    of the same file) are skipped by the unique lower(email) index (ON CONFLICT
+    DO NOTHING) — no lookup query first, and no race with a concurrent upload
+    of the same address.
+    """
+    # Drop repeats within the chunk (first occurrence wins)
+    new_leads = {}
     for lead_data in valid_leads:
-        # Check if email already exists
-        existing = await db.execute(select(Lead).where(Lead.email == lead_data["email"]))
-        if existing.scalar_one_or_none():
-            duplicates += 1
-            continue
-
-        # Create new lead
-        lead = Lead(
-            email=lead_data.get("email"),
-            first_name=lead_data.get("first_name"),
-            last_name=lead_data.get("last_name"),
-            company=lead_data.get("company"),
-            phone=lead_data.get("phone"),
-            address=lead_data.get("address"),
-            property_type=lead_data.get("property_type"),
-            estimated_value=lead_data.get("estimated_value"),
-            status="uploaded",
-        )
-        db.add(lead)
-        created += 1
+        new_leads.setdefault(lead_data["email"], {field: lead_data.get(field) for field in LEAD_IMPORT_FIELDS})
+    rows = list(new_leads.values())
 
-    # Commit all changes
-    await db.commit()
+    if len(rows) >= COPY_THRESHOLD:
+        return await _copy_leads(db, rows)
 
-    return CSVUploadResponse(
-        filename=file.filename,
-        total_rows=len(valid_leads) + len(errors),
-        valid_rows=len(valid_leads),
-        invalid_rows=len(errors),
-        duplicates=duplicates,
-        created=created,
-        errors=errors,
+    result = await db.execute(
+        pg_insert(Lead).on_conflict_do_nothing(index_elements=[func.lower(Lead.email)]).returning(Lead.id),
+        [{**row, "status": "uploaded"} for row in rows],
     )
+    return len(result.all())
+
+
+async def _copy_leads(db: AsyncSession, rows: list[dict]) -> int:
+    """
+    Bulk-load new leads with COPY on the session's own connection (and transaction).
+    asyncpg streams the records in its binary format — far fewer bytes and
+    no per-row statement overhead compared to INSERT for large imports.
+
+    COPY can't skip conflicts, so rows land in a temp staging table first and
+    move into leads with INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+    Returns the number of leads created.
+    """
+    columns = ", ".join(LEAD_IMPORT_FIELDS)
+    await db.execute(
+        text(f"CREATE TEMP TABLE lead_import ON COMMIT DROP AS SELECT {columns} FROM leads WITH NO DATA")
+    )
+
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "lead_import",
+        columns=LEAD_IMPORT_FIELDS,
+        records=[tuple(row[field] for field in LEAD_IMPORT_FIELDS) for row in rows],
+    )
+
+    result = await db.execute(
+        text(
+            f"INSERT INTO leads ({columns}, status) SELECT {columns}, 'uploaded' FROM lead_import "
+            "ON CONFLICT (lower(email)) DO NOTHING"
+        )
+    )
+    return result.rowcount
 
 
 # ============================================
@@ -129,49 +288,31 @@ async def get_leads(
     - **status**: Filter by lead status
     - **search**: Search in email, first_name, last_name
     """
-    # Build query
-    query = select(Lead)
-
-    # Apply filters
+    # Build filters
+    filters = []
     if status:
-        query = query.where(Lead.status == status)
+        filters.append(Lead.status == status)
 
     if search:
         search_term = f"%{search}%"
-        query = query.where(
+        filters.append(
             (Lead.email.ilike(search_term)) | (Lead.first_name.ilike(search_term)) | (Lead.last_name.ilike(search_term))
         )
 
-    # Get total count
-    count_query = select(func.count()).select_from(Lead)
-    if status:
-        count_query = count_query.where(Lead.status == status)
-    if search:
-        search_term = f"%{search}%"
-        count_query = count_query.where(
-            (Lead.email.ilike(search_term)) | (Lead.first_name.ilike(search_term)) | (Lead.last_name.ilike(search_term))
-        )
+    offset = (page - 1) * per_page
 
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Page + total count
+    leads, total = await fetch_page(db, Lead, filters, (Lead.created_at.desc(),), offset, per_page)
 
     # Calculate pagination
     total_pages = (total + per_page - 1) // per_page
-    offset = (page - 1) * per_page
-
-    # Apply pagination and ordering
-    query = query.order_by(Lead.created_at.desc()).offset(offset).limit(per_page)
-
-    # Execute query
-    result = await db.execute(query)
-    leads = result.scalars().all()
 
     return LeadListResponse(
         total=total,
         page=page,
         per_page=per_page,
         total_pages=total_pages,
-        items=[LeadResponse.model_validate(lead) for lead in leads],
+        items=_lead_list_adapter.validate_python(leads, from_attributes=True),
     )
 
 
@@ -189,61 +330,98 @@ async def get_lead(lead_id: int, db: AsyncSession = Depends(get_db)):
     - Replies received
     - Bookings scheduled
     """
-    # Get lead with relationships
+    # The whole response is built by Postgres as one JSON document: each relation
+    # is aggregated once (json_agg + count) in a LATERAL join, and the text is sent
+    # to the client as-is — no ORM objects, and Python never decodes the history.
+    sequences = _history_lateral(
+        "sequences",
+        EmailSequence,
+        EmailSequence.lead_id,
+        id=EmailSequence.id,
+        sequence_day=EmailSequence.sequence_day,
+        email_subject=EmailSequence.email_subject,
+        status=EmailSequence.status,
+        sent_at=EmailSequence.sent_at,
+        opened_at=EmailSequence.opened_at,
+        clicked_at=EmailSequence.clicked_at,
+        replied_at=EmailSequence.replied_at,
+    )
+    replies = _history_lateral(
+        "replies",
+        Reply,
+        Reply.lead_id,
+        id=Reply.id,
+        email_subject=Reply.email_subject,
+        email_body=Reply.email_body,
+        sentiment=Reply.sentiment,
+        confidence_score=Reply.confidence_score,
+        received_at=Reply.received_at,
+    )
+    bookings = _history_lateral(
+        "bookings",
+        Booking,
+        Booking.lead_id,
+        id=Booking.id,
+        scheduled_time=Booking.scheduled_time,
+        calendly_response_status=Booking.calendly_response_status,
+        created_at=Booking.created_at,
+    )
+
+    document = _json_object(
+        lead=_json_object(**{name: getattr(Lead, name) for name in LeadResponse.model_fields}),
+        email_sequences=sequences.c.entries,
+        replies=replies.c.entries,
+        bookings=bookings.c.entries,
+        stats=_json_object(
+            total_emails_sent=sequences.c.total,
+            total_replies=replies.c.total,
+            total_bookings=bookings.c.total,
+        ),
+    )
     query = (
-        select(Lead)
-        .options(selectinload(Lead.email_sequences), selectinload(Lead.replies), selectinload(Lead.bookings))
+        select(cast(document, Text))
+        .select_from(Lead)
+        .join(sequences, true())
+        .join(replies, true())
+        .join(bookings, true())
         .where(Lead.id == lead_id)
     )
 
     result = await db.execute(query)
-    lead = result.scalar_one_or_none()
+    body = result.scalar_one_or_none()
 
-    if not lead:
+    if body is None:
         raise HTTPException(status_code=404, detail=f"Lead with ID {lead_id} not found")
 
-    # Build response with history
-    return {
-        "lead": LeadResponse.model_validate(lead),
-        "email_sequences": [
-            {
-                "id": es.id,
-                "sequence_day": es.sequence_day,
-                "email_subject": es.email_subject,
-                "status": es.status,
-                "sent_at": es.sent_at,
-                "opened_at": es.opened_at,
-                "clicked_at": es.clicked_at,
-                "replied_at": es.replied_at,
-            }
-            for es in lead.email_sequences
-        ],
-        "replies": [
-            {
-                "id": r.id,
-                "email_subject": r.email_subject,
-                "email_body": r.email_body,
-                "sentiment": r.sentiment,
-                "confidence_score": float(r.confidence_score) if r.confidence_score else None,
-                "received_at": r.received_at,
-            }
-            for r in lead.replies
-        ],
-        "bookings": [
-            {
-                "id": b.id,
-                "scheduled_time": b.scheduled_time,
-                "calendly_response_status": b.calendly_response_status,
-                "created_at": b.created_at,
-            }
-            for b in lead.bookings
-        ],
-        "stats": {
-            "total_emails_sent": len(lead.email_sequences),
-            "total_replies": len(lead.replies),
-            "total_bookings": len(lead.bookings),
-        },
-    }
+    return Response(content=body, media_type="application/json")
+
+
+def _json_object(**fields):
+    """
+    json_build_object(key1, value1, key2, value2, ...) from keyword arguments.
+    Keys are Python identifiers, so they are written into the SQL as literals.
+    """
+    return func.json_build_object(
+        *(part for key, value in fields.items() for part in (literal_column(f"'{key}'"), value))
+    )
+
+
+def _history_lateral(name, model, lead_id_column, **fields):
+    """
+    LATERAL subquery over the lead's `model` rows with two columns: `entries`, a
+    JSON array of objects with the given fields (ordered by id, [] when there
+    are none), and `total`, the row count.
+    """
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(_json_object(**fields), model.id)), text("'[]'::json")
+            ).label("entries"),
+            func.count().label("total"),
+        )
+        .where(lead_id_column == Lead.id)
+        .lateral(name)
+    )
 
 
 # ============================================
@@ -258,9 +436,7 @@ async def get_lead_email_history(lead_id: int, db: AsyncSession = Depends(get_db
     """
     from app.models import EmailSequence
 
-    result = await db.execute(select(Lead).where(Lead.id == lead_id))
-    lead = result.scalar_one_or_none()
-    if not lead:
+    if not await db.scalar(select(exists().where(Lead.id == lead_id))):
         raise HTTPException(status_code=404, detail=f"Lead with ID {lead_id} not found")
 
     result = await db.execute(
@@ -299,8 +475,7 @@ async def get_lead_activity(lead_id: int, db: AsyncSession = Depends(get_db)):
     """
     from app.models import ChatbotMessage, EmailSequence, Reply, SmsMessage, VoiceCall
 
-    result = await db.execute(select(Lead).where(Lead.id == lead_id))
-    if not result.scalar_one_or_none():
+    if not await db.scalar(select(exists().where(Lead.id == lead_id))):
         raise HTTPException(status_code=404, detail=f"Lead with ID {lead_id} not found")
 
     events = []
@@ -404,29 +579,32 @@ async def get_lead_activity(lead_id: int, db: AsyncSession = Depends(get_db)):
 @router.post("", response_model=LeadResponse)
 async def create_lead(lead_data: LeadCreate, db: AsyncSession = Depends(get_db)):
     """Create a single lead manually"""
-    # Check if email already exists
-    existing = await db.execute(select(Lead).where(Lead.email == lead_data.email.lower()))
-    if existing.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail=f"Lead with email {lead_data.email} already exists")
-
-    # Create lead
-    lead = Lead(
-        email=lead_data.email.lower(),
-        first_name=lead_data.first_name,
-        last_name=lead_data.last_name,
-        company=lead_data.company,
-        phone=lead_data.phone,
-        address=lead_data.address,
-        property_type=lead_data.property_type,
-        estimated_value=lead_data.estimated_value,
-        notes=lead_data.notes,
-        created_by=lead_data.created_by,
-        status="uploaded",
+    # Create lead. The unique lower(email) index does the (case-insensitive) duplicate
+    # check in the same statement: an existing address inserts nothing and returns no row.
+    result = await db.execute(
+        pg_insert(Lead)
+        .values(
+            email=lead_data.email,
+            first_name=lead_data.first_name,
+            last_name=lead_data.last_name,
+            company=lead_data.company,
+            phone=lead_data.phone,
+            address=lead_data.address,
+            property_type=lead_data.property_type,
+            estimated_value=lead_data.estimated_value,
+            notes=lead_data.notes,
+            created_by=lead_data.created_by,
+            status="uploaded",
+        )
+        .on_conflict_do_nothing(index_elements=[func.lower(Lead.email)])
+        .returning(Lead)
     )
+    lead = result.scalar_one_or_none()
+
+    if not lead:
+        raise HTTPException(status_code=400, detail=f"Lead with email {lead_data.email} already exists")
 
-    db.add(lead)
     await db.commit()
-    await db.refresh(lead)
 
     return LeadResponse.model_validate(lead)
 
@@ -444,8 +622,6 @@ async def update_lead(lead_id: int, lead_data: LeadUpdate, db: AsyncSession = De
     # Update fields
     update_data = lead_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
-        if field == "email" and value:
-            value = value.lower()
         setattr(lead, field, value)
 
     await db.commit()
@@ -457,14 +633,13 @@ async def update_lead(lead_id: int, lead_data: LeadUpdate, db: AsyncSession = De
 @router.delete("/{lead_id}", response_model=MessageResponse)
 async def delete_lead(lead_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a lead (and all related records via CASCADE)"""
-    # Get lead
-    result = await db.execute(select(Lead).where(Lead.id == lead_id))
-    lead = result.scalar_one_or_none()
+    # One DELETE; the ON DELETE CASCADE foreign keys remove the related rows in the
+    # database, so nothing is loaded here. No row back means the lead doesn't exist.
+    result = await db.execute(delete(Lead).where(Lead.id == lead_id).returning(Lead.id))
 
-    if not lead:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail=f"Lead with ID {lead_id} not found")
 
-    await db.delete(lead)
     await db.commit()
 
     return MessageResponse(message=f"Lead {lead_id} deleted successfully")
@@ -473,8 +648,6 @@ async def delete_lead(lead_id: int, db: AsyncSession = Depends(get_db)):
 @router.get("/template/csv")
 async def get_csv_template():
     """Download a sample CSV template"""
-    from fastapi.responses import Response
-
     csv_content = CSVParser.get_sample_csv()
 
     return Response(
@@ -524,7 +697,7 @@ async def score_single_lead(
         available_campaigns=available_campaigns,
     )
 
-    from datetime import datetime
+    from datetime import UTC, datetime
     existing = await db.execute(
         select(AiLeadScore).where(AiLeadScore.lead_id == lead.id)
     )
@@ -536,7 +709,7 @@ async def score_single_lead(
         score_row.reasoning = ai_result.get("reasoning")
         score_row.recommended_campaign = ai_result.get("recommended_campaign")
         score_row.personalization_hints = ai_result.get("personalization_hints")
-        score_row.scored_at = datetime.utcnow()
+        score_row.scored_at = datetime.now(UTC)
     else:
         score_row = AiLeadScore(
             lead_id=lead.id,
@@ -546,7 +719,7 @@ async def score_single_lead(
             recommended_campaign=ai_result.get("recommended_campaign"),
             personalization_hints=ai_result.get("personalization_hints"),
             ai_model_used="gpt-4o",
-            scored_at=datetime.utcnow(),
+            scored_at=datetime.now(UTC),
         )
         db.add(score_row)
 
@@ -575,7 +748,7 @@ async def score_bulk_leads(
     Iterates through the provided lead IDs, scores each one, and persists
     results. Returns all scoring results in a single response.
     """
-    from datetime import datetime
+    from datetime import UTC, datetime
 
     leads_result = await db.execute(
         select(Lead).where(Lead.id.in_(payload.lead_ids))
@@ -590,6 +763,12 @@ async def score_bulk_leads(
     )
     available_campaigns = [row[0] for row in campaigns_result.fetchall()]
 
+    # Existing scores for all these leads in one lookup, instead of one SELECT per lead
+    scores_result = await db.execute(
+        select(AiLeadScore).where(AiLeadScore.lead_id.in_([lead.id for lead in leads]))
+    )
+    existing_scores = {score.lead_id: score for score in scores_result.scalars()}
+
     results = []
     for lead in leads:
         lead_data = {
@@ -611,10 +790,7 @@ async def score_bulk_leads(
         )
 
         # Upsert
-        existing = await db.execute(
-            select(AiLeadScore).where(AiLeadScore.lead_id == lead.id)
-        )
-        score_row = existing.scalar_one_or_none()
+        score_row = existing_scores.get(lead.id)
 
         if score_row:
             score_row.score = ai_result["score"]
@@ -622,7 +798,7 @@ async def score_bulk_leads(
             score_row.reasoning = ai_result.get("reasoning")
             score_row.recommended_campaign = ai_result.get("recommended_campaign")
             score_row.personalization_hints = ai_result.get("personalization_hints")
-            score_row.scored_at = datetime.utcnow()
+            score_row.scored_at = datetime.now(UTC)
         else:
             score_row = AiLeadScore(
                 lead_id=lead.id,
@@ -632,7 +808,7 @@ async def score_bulk_leads(
                 recommended_campaign=ai_result.get("recommended_campaign"),
                 personalization_hints=ai_result.get("personalization_hints"),
                 ai_model_used="gpt-4o",
-                scored_at=datetime.utcnow(),
+                scored_at=datetime.now(UTC),
             )
             db.add(score_row)
 
@@ -33,12 +33,12 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import get_settings
+from app.config import settings
 from app.database import get_db
 from app.models import EmailSequence, Lead
+from app.utils.cache import dashboard_cache
 
 router = APIRouter()
-settings = get_settings()
 
 
 # ============================================
@@ -65,6 +65,7 @@ class SendGridEvent(BaseModel):
     email: str
     type: str | None = None  # For bounce events: "hard" or "soft"
     reason: str | None = None  # For bounce events: reason text
+    sequence_id: str | None = None  # custom_arg set on campaign batch sends
 
     class Config:
         json_schema_extra = {
@@ -191,7 +192,7 @@ async def process_event(db: AsyncSession, event: dict) -> bool:
     """
     event_type = event.get("event", "").lower()
     timestamp = event.get("timestamp")
-    event_time = datetime.utcfromtimestamp(timestamp) if timestamp else datetime.utcnow()
+    event_time = datetime.fromtimestamp(timestamp, UTC) if timestamp else datetime.now(UTC)
 
     # SendGrid message IDs include a suffix after a dot (e.g. "abc123.filter001...")
     # We only stored the base ID when we sent the email, so strip the suffix
@@ -202,8 +203,17 @@ async def process_event(db: AsyncSession, event: dict) -> bool:
         print(f"⚠️  Event '{event_type}' missing message_id — skipping")
         return False
 
-    # Find the EmailSequence row that matches this message
-    result = await db.execute(select(EmailSequence).where(EmailSequence.sendgrid_message_id == message_id))
+    # Find the EmailSequence row that matches this message.
+    # Campaign batch sends share one message_id across up to 1000 recipients,
+    # so prefer the sequence_id custom arg SendGrid echoes back on each event.
+    sequence_id = event.get("sequence_id")
+    if sequence_id and str(sequence_id).isdigit():
+        query = select(EmailSequence).where(
+            EmailSequence.id == int(sequence_id), EmailSequence.sendgrid_message_id == message_id
+        )
+    else:
+        query = select(EmailSequence).where(EmailSequence.sendgrid_message_id == message_id).limit(1)
+    result = await db.execute(query)
     sequence = result.scalar_one_or_none()
 
     if not sequence:
@@ -221,7 +231,6 @@ async def process_event(db: AsyncSession, event: dict) -> bool:
             # Only record the FIRST open (SendGrid fires this on every open)
             sequence.opened_at = event_time
             sequence.status = "opened"
-            sequence.updated_at = datetime.utcnow()
             await try_advance_lead_status(db, lead_id, "contacted")
             print(f"📬 Opened: sequence {sequence.id} | lead {lead_id}")
         else:
@@ -230,7 +239,6 @@ async def process_event(db: AsyncSession, event: dict) -> bool:
     elif event_type == "click":
         if not sequence.clicked_at:
             sequence.clicked_at = event_time
-            sequence.updated_at = datetime.utcnow()
             # A click implies the email was opened too
             if not sequence.opened_at:
                 sequence.opened_at = event_time
@@ -249,7 +257,6 @@ async def process_event(db: AsyncSession, event: dict) -> bool:
 
         sequence.status = "bounced"
         sequence.bounce_reason = full_reason[:255]  # Column is VARCHAR(255)
-        sequence.updated_at = datetime.utcnow()
         print(f"⚡ Bounced: sequence {sequence.id} | {full_reason[:60]}")
 
         # Hard bounce = address permanently invalid — suppress the lead
@@ -260,7 +267,6 @@ async def process_event(db: AsyncSession, event: dict) -> bool:
     elif event_type == "spamreport":
         sequence.status = "bounced"
         sequence.bounce_reason = "Marked as spam by recipient"
-        sequence.updated_at = datetime.utcnow()
         await suppress_lead(db, lead_id, "Spam report")
         print(f"🚨 Spam report: sequence {sequence.id} | lead {lead_id}")
 
@@ -329,6 +335,9 @@ async def handle_sendgrid_events(
         print(f"❌ DB commit failed after webhook processing: {e}")
         raise HTTPException(status_code=500, detail="Database commit failed")
 
+    if processed:
+        dashboard_cache.clear()
+
     print(f"✅ Webhook batch done: {total} received | {processed} processed | {skipped} skipped")
 
     # IMPORTANT: Return 200. If we return 4xx or 5xx, SendGrid retries the whole batch.
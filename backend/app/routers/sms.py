@@ -3,10 +3,11 @@ SMS Router (Step 3)
 Endpoints for sending SMS to leads via Twilio.
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -21,6 +22,9 @@ from app.utils.sms_service import personalize_body, sms_service
 
 router = APIRouter()
 
+# Validates all of a lead's messages in one call instead of one model_validate per row
+_sms_list_adapter = TypeAdapter(list[SmsMessageResponse])
+
 
 @router.post("/send", response_model=SmsSendResponse)
 async def send_sms_to_lead(
@@ -76,7 +80,7 @@ async def send_sms_to_lead(
         body=body,
         status="sent" if success else "failed",
         twilio_sid=twilio_sid,
-        sent_at=datetime.utcnow() if success else None,
+        sent_at=datetime.now(UTC) if success else None,
     )
     db.add(sms_record)
     await db.commit()
@@ -99,9 +103,7 @@ async def get_sms_history(
     db: AsyncSession = Depends(get_db),
 ):
     """Return all SMS messages sent to this lead, oldest first."""
-    result = await db.execute(select(Lead).where(Lead.id == lead_id))
-    lead = result.scalar_one_or_none()
-    if not lead:
+    if not await db.scalar(select(exists().where(Lead.id == lead_id))):
         raise HTTPException(status_code=404, detail=f"Lead {lead_id} not found")
 
     result = await db.execute(
@@ -111,5 +113,5 @@ async def get_sms_history(
 
     return SmsHistoryResponse(
         lead_id=lead_id,
-        messages=[SmsMessageResponse.model_validate(m) for m in messages],
+        messages=_sms_list_adapter.validate_python(messages, from_attributes=True),
     )
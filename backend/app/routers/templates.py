@@ -4,7 +4,9 @@ Endpoints for managing email templates
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from pydantic import TypeAdapter
+from sqlalchemy import exists, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -17,9 +19,13 @@ from app.schemas import (
     MessageResponse,
 )
 from app.utils.email_service import EmailService
+from app.utils.pagination import fetch_page
 
 router = APIRouter()
 
+# Validates a whole page of ORM rows in one call instead of one model_validate per row
+_template_list_adapter = TypeAdapter(list[EmailTemplateResponse])
+
 
 # ============================================
 # CREATE TEMPLATE
@@ -35,17 +41,13 @@ async def create_template(template_data: EmailTemplateCreate, db: AsyncSession =
     - {{address}}, {{property_type}}, {{estimated_value}}
     """
     # Check if name already exists
-    existing = await db.execute(select(EmailTemplate).where(EmailTemplate.name == template_data.name))
-    if existing.scalar_one_or_none():
+    if await db.scalar(select(exists().where(EmailTemplate.name == template_data.name))):
         raise HTTPException(status_code=400, detail=f"Template with name '{template_data.name}' already exists")
 
     # If setting as default, unset other defaults
     if template_data.is_default:
-        await db.execute(select(EmailTemplate).where(EmailTemplate.is_default == True))
-        # Update all to non-default
-        result = await db.execute(select(EmailTemplate).where(EmailTemplate.is_default == True))
-        for tmpl in result.scalars().all():
-            tmpl.is_default = False
+        # One UPDATE in the database — no need to load the current defaults first
+        await db.execute(update(EmailTemplate).where(EmailTemplate.is_default == True).values(is_default=False))
 
     # Create template
     template = EmailTemplate(
@@ -75,35 +77,27 @@ async def get_templates(
 ):
     """Get all email templates with pagination"""
 
-    # Build query
-    query = select(EmailTemplate)
-
+    # Build filters
+    filters = []
     if search:
-        query = query.where(EmailTemplate.name.ilike(f"%{search}%"))
+        filters.append(EmailTemplate.name.ilike(f"%{search}%"))
 
-    # Get total count
-    count_query = select(func.count()).select_from(EmailTemplate)
-    if search:
-        count_query = count_query.where(EmailTemplate.name.ilike(f"%{search}%"))
+    offset = (page - 1) * per_page
 
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Page + total count
+    templates, total = await fetch_page(
+        db, EmailTemplate, filters, (EmailTemplate.created_at.desc(),), offset, per_page
+    )
 
     # Pagination
     total_pages = (total + per_page - 1) // per_page
-    offset = (page - 1) * per_page
-
-    query = query.order_by(EmailTemplate.created_at.desc()).offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-    templates = result.scalars().all()
 
     return EmailTemplateListResponse(
         total=total,
         page=page,
         per_page=per_page,
         total_pages=total_pages,
-        items=[EmailTemplateResponse.model_validate(t) for t in templates],
+        items=_template_list_adapter.validate_python(templates, from_attributes=True),
     )
 
 
@@ -154,10 +148,11 @@ async def update_template(template_id: int, template_data: EmailTemplateUpdate,
 
     # If setting as default, unset others
     if template_data.is_default:
-        all_templates = await db.execute(select(EmailTemplate).where(EmailTemplate.is_default == True))
-        for tmpl in all_templates.scalars().all():
-            if tmpl.id != template_id:
-                tmpl.is_default = False
+        await db.execute(
+            update(EmailTemplate)
+            .where(EmailTemplate.is_default == True, EmailTemplate.id != template_id)
+            .values(is_default=False)
+        )
 
     # Update fields
     update_data = template_data.model_dump(exclude_unset=True)
@@ -192,7 +187,7 @@ async def delete_template(template_id: int, db: AsyncSession = Depends(get_db)):
 # ============================================
 # PREVIEW TEMPLATE WITH SAMPLE DATA
 # ============================================
-@router.post("/{template_id}/preview")
+@router.post("/{template_id}/preview", response_model=dict)
 async def preview_template(template_id: int, sample_data: dict | None = None, db: AsyncSession = Depends(get_db)):
     """
     Preview a template with sample or provided data.
@@ -216,12 +211,17 @@ async def preview_template(template_id: int, sample_data: dict | None = None, db
         "estimated_value": "$450,000",
     }
 
+    # Compile subject and body once (cached) and reuse the parts for both
+    # rendering and listing placeholders (field names sit at odd indexes)
+    subject_parts = EmailService.compile_template(template.subject)
+    body_parts = EmailService.compile_template(template.body)
+
     # Personalize
-    personalized_subject = EmailService.personalize_template(template.subject, lead_data)
-    personalized_body = EmailService.personalize_template(template.body, lead_data)
+    personalized_subject = EmailService.render_template(subject_parts, lead_data)
+    personalized_body = EmailService.render_template(body_parts, lead_data)
 
     # Extract placeholders used
-    placeholders = EmailService.extract_placeholders(template.subject + template.body)
+    placeholders = subject_parts[1::2] + body_parts[1::2]
 
     return {
         "template_id": template.id,
@@ -289,16 +289,13 @@ Best regards,
         },
     ]
 
-    created = 0
-    for tmpl_data in default_templates:
-        # Check if exists
-        existing = await db.execute(select(EmailTemplate).where(EmailTemplate.name == tmpl_data["name"]))
-        if existing.scalar_one_or_none():
-            continue
-
-        template = EmailTemplate(**tmpl_data)
-        db.add(template)
-        created += 1
+    # Insert them all in one statement; names that already exist are skipped
+    # by the unique constraint (ON CONFLICT DO NOTHING) instead of a lookup each
+    result = await db.execute(
+        pg_insert(EmailTemplate).on_conflict_do_nothing(index_elements=["name"]).returning(EmailTemplate.id),
+        default_templates,
+    )
+    created = len(result.all())
 
     await db.commit()
 
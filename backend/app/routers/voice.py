@@ -3,14 +3,15 @@ Voice Router (Step 4)
 Endpoints for AI outbound voice calls via Retell AI + Twilio.
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config import get_settings
+from app.config import settings
 from app.database import get_db
 from app.models import Lead, VoiceCall
 from app.schemas import (
@@ -22,9 +23,11 @@ from app.schemas import (
 from app.utils.sms_service import normalize_phone
 from app.utils.voice_service import voice_service
 
-settings = get_settings()
 router = APIRouter()
 
+# Validates all of a lead's calls in one call instead of one model_validate per row
+_voice_call_list_adapter = TypeAdapter(list[VoiceCallDetailResponse])
+
 
 @router.post("/call", response_model=VoiceCallResponse)
 async def start_voice_call(
@@ -74,7 +77,7 @@ async def start_voice_call(
         retell_call_id=retell_call_id,
         retell_agent_id=settings.RETELL_AGENT_ID,
         status="calling" if success else "failed",
-        started_at=datetime.utcnow() if success else None,
+        started_at=datetime.now(UTC) if success else None,
     )
     db.add(voice_record)
     await db.commit()
@@ -97,8 +100,7 @@ async def get_voice_history(
     db: AsyncSession = Depends(get_db),
 ):
     """Return all voice calls for this lead, newest first."""
-    result = await db.execute(select(Lead).where(Lead.id == lead_id))
-    if not result.scalar_one_or_none():
+    if not await db.scalar(select(exists().where(Lead.id == lead_id))):
         raise HTTPException(status_code=404, detail=f"Lead {lead_id} not found")
 
     result = await db.execute(
@@ -108,7 +110,7 @@ async def get_voice_history(
 
     return VoiceCallHistoryResponse(
         lead_id=lead_id,
-        calls=[VoiceCallDetailResponse.model_validate(c) for c in calls],
+        calls=_voice_call_list_adapter.validate_python(calls, from_attributes=True),
     )
 
 
@@ -163,7 +165,7 @@ async def retell_webhook(
 
     if event == "call_ended":
         voice_call.status = _map_retell_status(call_data.get("call_status"))
-        voice_call.ended_at = datetime.utcnow()
+        voice_call.ended_at = datetime.now(UTC)
         duration_ms = call_data.get("duration_ms") or call_data.get("call_duration_ms")
         if duration_ms:
             voice_call.duration_seconds = int(duration_ms / 1000)
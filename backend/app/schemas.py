@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
 # ============================================
 # GENERAL RESPONSE SCHEMAS
@@ -87,7 +88,7 @@ class CampaignUpdate(BaseModel):
     name: str | None = Field(None, max_length=255)
     description: str | None = None
     email_template: str | None = None
-    status: str | None = Field(None, pattern="^(draft|scheduled|active|completed|paused)$")
+    status: Literal["draft", "scheduled", "active", "completed", "paused"] | None = None
 
 
 class CampaignResponse(BaseModel):
@@ -108,10 +109,18 @@ class CampaignResponse(BaseModel):
         from_attributes = True
 
 
+class CampaignCursor(BaseModel):
+    """Keyset cursor for the next campaign page (pass back as ?after=&after_id=)"""
+
+    after: datetime
+    after_id: int
+
+
 class CampaignListResponse(PaginatedResponse):
     """List of campaigns"""
 
     items: list[CampaignResponse]
+    next_cursor: CampaignCursor | None = None
 
 
 class CampaignStartRequest(BaseModel):
@@ -123,6 +132,12 @@ class CampaignStartRequest(BaseModel):
     body: str | None = None
 
 
+class CampaignQuickStartRequest(CampaignStartRequest):
+    """Create a campaign and start it in one call"""
+
+    name: str = Field(..., min_length=1, max_length=255)
+
+
 # ============================================
 # LEAD SCHEMAS
 # ============================================
@@ -154,7 +169,7 @@ class LeadUpdate(BaseModel):
     address: str | None = Field(None, max_length=255)
     property_type: str | None = Field(None, max_length=100)
     estimated_value: str | None = Field(None, max_length=50)
-    status: str | None = Field(None, pattern="^(uploaded|contacted|replied|interested|booked|closed)$")
+    status: Literal["uploaded", "contacted", "replied", "interested", "booked", "closed"] | None = None
     notes: str | None = None
 
 
@@ -186,10 +201,27 @@ class LeadListResponse(PaginatedResponse):
     items: list[LeadResponse]
 
 
+class LeadBulkItem(LeadCreate):
+    """
+    One lead in a bulk create. Uses the same basic email check as the CSV
+    import rather than EmailStr, whose full address parsing would run on
+    every row of a large batch.
+    """
+
+    email: str = Field(..., max_length=255)
+
+    @field_validator("email")
+    @classmethod
+    def check_email(cls, v: str) -> str:
+        if "@" not in v or "." not in v:
+            raise ValueError("Invalid email format")
+        return v
+
+
 class LeadBulkCreate(BaseModel):
     """Bulk create leads from CSV data"""
 
-    leads: list[LeadCreate]
+    leads: list[LeadBulkItem]
 
 
 class LeadBulkResponse(BaseModel):
@@ -199,6 +231,7 @@ class LeadBulkResponse(BaseModel):
     created: int
     duplicates: int
     errors: list[str]
+    errors_truncated: int = 0  # Errors beyond those listed
 
 
 # ============================================
@@ -219,7 +252,7 @@ class EmailSequenceCreate(BaseModel):
 class EmailSequenceUpdate(BaseModel):
     """Update email sequence status"""
 
-    status: str | None = Field(None, pattern="^(pending|scheduled|sent|opened|replied|bounced)$")
+    status: Literal["pending", "scheduled", "sent", "opened", "replied", "bounced"] | None = None
     sent_at: datetime | None = None
     opened_at: datetime | None = None
     clicked_at: datetime | None = None
@@ -268,7 +301,7 @@ class ReplyCreate(BaseModel):
     email_from: str | None = Field(None, max_length=255)
     email_subject: str | None = Field(None, max_length=255)
     email_body: str | None = None
-    sentiment: str | None = Field(None, pattern="^(interested|not_now|unsubscribe|other)$")
+    sentiment: Literal["interested", "not_now", "unsubscribe", "other"] | None = None
     confidence_score: float | None = Field(None, ge=0, le=1)
     ai_model_used: str | None = Field(None, max_length=50)
     received_at: datetime | None = None
@@ -277,7 +310,7 @@ class ReplyCreate(BaseModel):
 class ReplyUpdate(BaseModel):
     """Update a reply (e.g., after AI processing)"""
 
-    sentiment: str | None = Field(None, pattern="^(interested|not_now|unsubscribe|other)$")
+    sentiment: Literal["interested", "not_now", "unsubscribe", "other"] | None = None
     confidence_score: float | None = Field(None, ge=0, le=1)
     ai_model_used: str | None = Field(None, max_length=50)
     processed_at: datetime | None = None
@@ -321,14 +354,14 @@ class BookingCreate(BaseModel):
     event_uri: str | None = Field(None, max_length=255)
     scheduled_time: datetime
     calendly_invitee_email: str | None = Field(None, max_length=255)
-    calendly_response_status: str | None = Field(None, pattern="^(confirmed|tentative|cancelled)$")
+    calendly_response_status: Literal["confirmed", "tentative", "cancelled"] | None = None
 
 
 class BookingUpdate(BaseModel):
     """Update a booking"""
 
     scheduled_time: datetime | None = None
-    calendly_response_status: str | None = Field(None, pattern="^(confirmed|tentative|cancelled)$")
+    calendly_response_status: Literal["confirmed", "tentative", "cancelled"] | None = None
 
 
 class BookingResponse(BaseModel):
@@ -442,7 +475,28 @@ class CSVUploadResponse(BaseModel):
     invalid_rows: int
     duplicates: int
     created: int
-    errors: list[str]
+    errors: list[str]  # First MAX_REPORTED_ERRORS messages
+    errors_truncated: int = 0  # Errors beyond those listed
+
+
+class LeadImportJobResponse(BaseModel):
+    """Status of a background CSV import (counts are filled in once it completes)"""
+
+    id: int
+    filename: str
+    status: str  # pending | running | completed | failed
+    total_rows: int
+    valid_rows: int
+    invalid_rows: int
+    duplicates: int
+    created: int
+    errors: list[str] | None = None
+    errors_truncated: int = 0
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
 
 
 # ============================================
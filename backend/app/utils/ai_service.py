@@ -1,11 +1,100 @@
 import json
-from typing import Any
+import math
+import re
+from typing import TYPE_CHECKING, Any
 
-from openai import AsyncOpenAI
+from pydantic import BaseModel, ValidationError, field_validator
 
-from app.config import get_settings
+from app.config import settings
 
-settings = get_settings()
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+def _keyword_pattern(*keywords: str) -> re.Pattern[str]:
+    """One precompiled alternation, so checking a message for any keyword is a single scan"""
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+# Chatbot intent keywords, matched as substrings of the lowercased last user message
+_PRICING_INTENT = _keyword_pattern("price", "pricing", "$")
+_MEETING_INTENT = _keyword_pattern("demo", "call", "meeting")
+_FRUSTRATION_INTENT = _keyword_pattern("frustrated", "angry", "upset", "this is not helpful")
+_END_INTENT = _keyword_pattern("thanks, that's all", "thank you, that's all", "no more questions")
+
+_NEXT_ACTION_TYPES = frozenset({"continue", "book_meeting", "escalate_human", "end"})
+_CHAT_ROLES = frozenset({"user", "assistant", "system"})
+
+# Most recent chat messages sent to the LLM with each chatbot request
+CHATBOT_HISTORY_WINDOW = 10
+
+
+# A reply wrapped in a ```json ... ``` fence, as models often return despite the prompt
+_JSON_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+class _ChatbotLLMNextAction(BaseModel):
+    type: str | None = None
+    reason: str | None = None
+
+    @field_validator("type", "reason", mode="before")
+    @classmethod
+    def _text_or_none(cls, value: Any) -> str | None:
+        return value if isinstance(value, str) else None
+
+
+class _ChatbotLLMReply(BaseModel):
+    """
+    JSON shape the chatbot prompt asks the model for (every field optional; gaps get defaults).
+    Fields are validated leniently: a malformed field is dropped, never the whole reply.
+    """
+
+    reply: str | None = None
+    next_action: _ChatbotLLMNextAction | None = None
+    updated_lead_score: float | None = None
+
+    @field_validator("reply", mode="before")
+    @classmethod
+    def _reply_text(cls, value: Any) -> str | None:
+        return value if isinstance(value, str) else None
+
+    @field_validator("next_action", mode="before")
+    @classmethod
+    def _next_action_object(cls, value: Any) -> dict | None:
+        if isinstance(value, str):
+            return {"type": value}  # Just the action name, e.g. "book_meeting"
+        return value if isinstance(value, dict) else None
+
+    @field_validator("updated_lead_score", mode="before")
+    @classmethod
+    def _score_number(cls, value: Any) -> float | None:
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                return None
+        if isinstance(value, bool) or not isinstance(value, int | float) or not math.isfinite(value):
+            return None
+        return value
+
+
+# Fixed part of the chatbot system prompt; only the lead context after it varies per request
+_CHATBOT_SYSTEM_PROMPT = (
+    "You are a friendly, concise sales assistant. Your job is to qualify leads and help book demos.\n"
+    "Rules:\n"
+    "- Ask ONE question at a time.\n"
+    "- Keep responses under 50 words.\n"
+    "- If asked about pricing, qualify first (team size + use case).\n"
+    "- If the user wants a demo/call, suggest booking.\n"
+    "- If the user is frustrated or requests a human, escalate.\n"
+    "- Never promise unbuilt features. Never offer discounts.\n\n"
+    "Return ONLY a JSON object with this exact shape:\n"
+    "{\n"
+    '  "reply": string,\n'
+    '  "next_action": {"type": "continue|book_meeting|escalate_human|end", "reason": string},\n'
+    '  "updated_lead_score": number or null\n'
+    "}\n\n"
+)
 
 
 class AIService:
@@ -21,21 +110,32 @@ class AIService:
         # These can be extended later when wiring real LLMs
         self.primary_model = getattr(settings, "OPENAI_MODEL", "gpt-4.1")
         self.fallback_model = "gpt-3.5-turbo"
-        self._openai_client: AsyncOpenAI | None = None
+        self._client: "AsyncOpenAI | None" = None
 
-        # Lazily initialize OpenAI client (only when key exists)
-        if settings.OPENAI_API_KEY:
-            self._openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    @property
+    def _openai_client(self) -> "AsyncOpenAI | None":
+        """
+        Lazily initialize the OpenAI client on first use (only when key exists).
+        Demo deployments never import the SDK.
+        """
+        if self._client is None and settings.OPENAI_API_KEY:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        return self._client
 
     def _safe_next_action_type(self, value: str | None) -> str:
-        allowed = {"continue", "book_meeting", "escalate_human", "end"}
-        return value if value in allowed else "continue"
+        return value if value in _NEXT_ACTION_TYPES else "continue"
 
     def _parse_ai_json(self, text: str) -> dict[str, Any] | None:
         """
         Attempt to parse a JSON object from an LLM response.
         Returns None if parsing fails.
         """
+        # Plain-prose replies can't be an object; skip the raise/catch of a failed parse
+        if not text.lstrip().startswith("{"):
+            return None
+
         try:
             data = json.loads(text)
             if isinstance(data, dict):
@@ -63,21 +163,7 @@ class AIService:
         source = lead_context.get("source") or ""
         last_email_summary = lead_context.get("last_email_summary") or ""
 
-        system_prompt = (
-            "You are a friendly, concise sales assistant. Your job is to qualify leads and help book demos.\n"
-            "Rules:\n"
-            "- Ask ONE question at a time.\n"
-            "- Keep responses under 50 words.\n"
-            "- If asked about pricing, qualify first (team size + use case).\n"
-            "- If the user wants a demo/call, suggest booking.\n"
-            "- If the user is frustrated or requests a human, escalate.\n"
-            "- Never promise unbuilt features. Never offer discounts.\n\n"
-            "Return ONLY a JSON object with this exact shape:\n"
-            "{\n"
-            '  "reply": string,\n'
-            '  "next_action": {"type": "continue|book_meeting|escalate_human|end", "reason": string},\n'
-            '  "updated_lead_score": number or null\n'
-            "}\n\n"
+        system_prompt = _CHATBOT_SYSTEM_PROMPT + (
             "Context:\n"
             f"- Lead first name: {first_name}\n"
             f"- Company: {company}\n"
@@ -87,15 +173,15 @@ class AIService:
             f"- Last email summary: {last_email_summary}\n"
         )
 
-        # Keep only last ~10 messages for cost control
-        trimmed = messages[-10:] if len(messages) > 10 else messages
+        # Keep only the last CHATBOT_HISTORY_WINDOW messages for cost control
         openai_messages: list[dict[str, str]] = [{"role": "system", "content": system_prompt}]
-        for m in trimmed:
-            role = m.get("role", "user")
-            content = m.get("content", "")
-            if role not in {"user", "assistant", "system"}:
-                role = "user"
-            openai_messages.append({"role": role, "content": content})
+        openai_messages.extend(
+            {
+                "role": role if (role := m.get("role", "user")) in _CHAT_ROLES else "user",
+                "content": m.get("content", ""),
+            }
+            for m in messages[-CHATBOT_HISTORY_WINDOW:]
+        )
 
         resp = await self._openai_client.chat.completions.create(
             model=settings.OPENAI_MODEL or self.primary_model,
@@ -104,26 +190,38 @@ class AIService:
         )
 
         text = (resp.choices[0].message.content or "").strip()
-        parsed = self._parse_ai_json(text)
+        if fenced := _JSON_FENCE.match(text):
+            text = fenced.group(1)
 
-        # If model didn't return JSON, fallback to a safe wrapper
-        if not parsed:
+        # Parse and validate the JSON in one pydantic-core pass
+        try:
+            parsed = _ChatbotLLMReply.model_validate_json(text)
+        except ValidationError:
+            parsed = None
+
+        # If model didn't return usable JSON, fallback to a safe wrapper.
+        # Prose is passed through as the reply, but JSON-looking text never reaches the lead.
+        if not parsed or not parsed.model_fields_set:
             return {
-                "reply": text or "Thanks — could you share your biggest outreach challenge right now?",
+                "reply": (text if not text.startswith(("{", "[")) else "")
+                or "Thanks — could you share your biggest outreach challenge right now?",
                 "next_action": {"type": "continue", "reason": "LLM returned non-JSON; default to continue."},
                 "updated_lead_score": lead_score,
             }
 
-        next_action = parsed.get("next_action") or {}
-        action_type = self._safe_next_action_type(next_action.get("type"))
+        next_action = parsed.next_action or _ChatbotLLMNextAction()
+        action_type = self._safe_next_action_type(next_action.type)
 
         return {
-            "reply": str(parsed.get("reply") or "").strip() or "What’s your biggest challenge with outreach right now?",
+            "reply": (parsed.reply or "").strip() or "What’s your biggest challenge with outreach right now?",
             "next_action": {
                 "type": action_type,
-                "reason": str(next_action.get("reason") or "").strip() or None,
+                "reason": (next_action.reason or "").strip() or None,
             },
-            "updated_lead_score": parsed.get("updated_lead_score", lead_score),
+            # Null or unusable score = no change
+            "updated_lead_score": (
+                round(parsed.updated_lead_score) if parsed.updated_lead_score is not None else lead_score
+            ),
         }
 
     async def generate_chatbot_reply(
@@ -162,13 +260,13 @@ class AIService:
             )
 
             # Pricing intent
-            if "price" in normalized or "pricing" in normalized or "$" in normalized:
+            if _PRICING_INTENT.search(normalized):
                 base_reply = (
                     "Great question on pricing. Before that, how many people on your team "
                     "would use this outreach system?"
                 )
             # Demo / call intent
-            elif "demo" in normalized or "call" in normalized or "meeting" in normalized:
+            elif _MEETING_INTENT.search(normalized):
                 return {
                     "reply": "Sounds good. I can help arrange a quick demo. Do you prefer earlier this week or later?",
                     "next_action": {
@@ -178,7 +276,7 @@ class AIService:
                     "updated_lead_score": max((lead_context.get("lead_score") or 50) + 10, 0),
                 }
             # Frustration / escalation
-            elif any(w in normalized for w in ["frustrated", "angry", "upset", "this is not helpful"]):
+            elif _FRUSTRATION_INTENT.search(normalized):
                 return {
                     "reply": "I’m sorry this hasn’t been helpful so far. I can connect you with a human specialist if you’d like.",
                     "next_action": {
@@ -188,7 +286,7 @@ class AIService:
                     "updated_lead_score": lead_context.get("lead_score"),
                 }
             # Conversation end
-            elif any(w in normalized for w in ["thanks, that's all", "thank you, that's all", "no more questions"]):
+            elif _END_INTENT.search(normalized):
                 return {
                     "reply": "Glad I could help. If anything else comes up, you can reach out here again anytime.",
                     "next_action": {
@@ -222,7 +320,7 @@ class AIService:
             "To make sure this fits, what are you currently using for outreach?"
         )
 
-        if "demo" in normalized or "call" in normalized or "meeting" in normalized:
+        if _MEETING_INTENT.search(normalized):
             return {
                 "reply": "Happy to set something up. Would mid-week work better, or are you free earlier?",
                 "next_action": {
@@ -232,7 +330,7 @@ class AIService:
                 "updated_lead_score": max((lead_context.get("lead_score") or 50) + 10, 0),
             }
 
-        if "price" in normalized or "pricing" in normalized or "$" in normalized:
+        if _PRICING_INTENT.search(normalized):
             return {
                 "reply": "Pricing depends a bit on team size and volume. Roughly how many people would use this day to day?",
                 "next_action": {
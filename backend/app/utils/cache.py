@@ -0,0 +1,50 @@
+"""
+Response Cache
+===============
+Small in-process TTL cache for read-heavy endpoints (the dashboard).
+
+Values live in this worker's memory and expire after DASHBOARD_CACHE_TTL
+seconds. Endpoints that change what the dashboard shows (campaign start,
+demo simulations, SendGrid webhook events) call dashboard_cache.clear()
+after committing, so those changes show up on the next load instead of
+waiting out the TTL.
+"""
+
+import time
+from typing import Any
+
+from app.config import settings
+
+
+class TTLCache:
+    """
+    Key → value store whose entries expire `ttl` seconds after being set.
+
+    Not shared between worker processes — each worker warms its own copy.
+    A ttl of 0 disables caching (get() always misses).
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, Any]] = {}
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Any):
+        if self.ttl > 0:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Module-level singleton for GET /api/dashboard
+dashboard_cache = TTLCache(ttl=settings.DASHBOARD_CACHE_TTL)
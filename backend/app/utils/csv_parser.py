@@ -3,8 +3,19 @@ CSV Parser Utility
 Parses uploaded CSV files and extracts lead data
 """
 
+import codecs
 import csv
 import io
+from collections.abc import Iterator
+from typing import BinaryIO
+
+
+def _latin1_fallback(error: UnicodeDecodeError) -> tuple[str, int]:
+    """Codec error handler: decode bytes that aren't valid UTF-8 as latin-1 instead of failing"""
+    return error.object[error.start : error.end].decode("latin-1"), error.end
+
+
+codecs.register_error("latin1_fallback", _latin1_fallback)
 
 
 class CSVParser:
@@ -59,6 +70,18 @@ class CSVParser:
 
     REQUIRED_FIELDS = ["email", "first_name"]
 
+    # Rows handed to the caller per chunk by parse_stream()
+    CHUNK_SIZE = 5000
+
+    # Leading bytes sniffed for the encoding and delimiter
+    SNIFF_SIZE = 64 * 1024
+
+    # Delimiters recognised besides the default comma (Excel exports often use ; or tabs)
+    DELIMITERS = ",;\t|"
+
+    # get_sample_csv() output, built on first use (the template never changes)
+    _sample_csv: str | None = None
+
     @classmethod
     def parse(cls, file_content: bytes) -> tuple[list[dict], list[str]]:
         """
@@ -73,70 +96,148 @@ class CSVParser:
         valid_leads = []
         errors = []
 
-        try:
-            # Decode bytes to string
-            content = file_content.decode("utf-8")
-        except UnicodeDecodeError:
-            try:
-                content = file_content.decode("latin-1")
-            except Exception as e:
-                return [], [f"Failed to decode file: {str(e)}"]
+        for chunk_leads, chunk_errors in cls.parse_stream(io.BytesIO(file_content)):
+            valid_leads.extend(chunk_leads)
+            errors.extend(chunk_errors)
 
-        # Parse CSV
-        reader = csv.DictReader(io.StringIO(content))
+        return valid_leads, errors
 
-        # Map headers to standard field names
-        if not reader.fieldnames:
-            return [], ["CSV file is empty or has no headers"]
+    @classmethod
+    def parse_stream(cls, file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[list[dict], list[str]]]:
+        """
+        Parse a CSV file incrementally, yielding (valid_leads, errors) for every
+        `chunk_size` rows so the whole file is never held in memory.
 
-        header_mapping = cls._map_headers(reader.fieldnames)
+        Args:
+            file: Seekable binary file (e.g. UploadFile.file, a SpooledTemporaryFile)
+            chunk_size: Number of rows per yielded chunk
 
-        # Check required fields
-        mapped_fields = set(header_mapping.values())
-        missing_required = [f for f in cls.REQUIRED_FIELDS if f not in mapped_fields]
+        Yields:
+            Tuple of (valid_leads, errors) for each chunk of rows
+        """
+        # Sniff encoding and delimiter once from the head of the file, then parse
+        # the whole file in a single pass with both fixed
+        head = file.read(cls.SNIFF_SIZE)
+        file.seek(0)
 
-        if missing_required:
-            return [], [f"Missing required columns: {', '.join(missing_required)}"]
+        if b"\x00" in head:
+            yield [], ["File does not look like a CSV (binary content)"]
+            return
 
-        # Process rows
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-            lead_data, row_errors = cls._process_row(row, header_mapping, row_num)
+        encoding = cls._detect_encoding(head)
+        delimiter = cls._detect_delimiter(head.decode(encoding, errors="ignore"))
+        text_file = io.TextIOWrapper(file, encoding=encoding, errors="latin1_fallback", newline="")
 
-            if row_errors:
-                errors.extend(row_errors)
-            elif lead_data:
-                valid_leads.append(lead_data)
+        try:
+            # Parse CSV with the plain (C) reader: rows stay lists and each lead is
+            # built straight from the mapped column positions, instead of DictReader
+            # building a dict per row in Python first
+            reader = csv.reader(text_file, delimiter=delimiter)
+            headers = next(reader, None)
+
+            # Map headers to standard field names
+            if not headers:
+                yield [], ["CSV file is empty or has no headers"]
+                return
+
+            columns = cls._map_headers(headers)
+
+            # Check required fields
+            mapped_fields = {field for _, field in columns}
+            missing_required = [f for f in cls.REQUIRED_FIELDS if f not in mapped_fields]
+
+            if missing_required:
+                yield [], [f"Missing required columns: {', '.join(missing_required)}"]
+                return
+
+            # Process rows
+            valid_leads = []
+            errors = []
+            rows_in_chunk = 0
+            row_num = 1  # Header is row 1
+
+            for row in reader:
+                # Blank lines don't count as rows
+                if not row:
+                    continue
+                row_num += 1
+
+                lead_data, row_errors = cls._process_row(row, columns, row_num)
+
+                if row_errors:
+                    errors.extend(row_errors)
+                elif lead_data:
+                    valid_leads.append(lead_data)
+
+                rows_in_chunk += 1
+                if rows_in_chunk == chunk_size:
+                    yield valid_leads, errors
+                    valid_leads, errors, rows_in_chunk = [], [], 0
+
+            if valid_leads or errors:
+                yield valid_leads, errors
+        finally:
+            # Hand the underlying file back to its owner instead of closing it
+            text_file.detach()
 
-        return valid_leads, errors
+    @classmethod
+    def _detect_encoding(cls, head: bytes) -> str:
+        """
+        Return "utf-8" if the head of the file decodes as UTF-8, otherwise "latin-1"
+        (which accepts any byte). A stray invalid byte further into a UTF-8 file is
+        decoded as latin-1 by the "latin1_fallback" error handler rather than failing.
+        """
+        try:
+            # Incremental decode so a multi-byte character cut off at the end isn't an error
+            codecs.getincrementaldecoder("utf-8")().decode(head)
+            return "utf-8"
+        except UnicodeDecodeError:
+            return "latin-1"
 
     @classmethod
-    def _map_headers(cls, headers: list[str]) -> dict[str, str]:
-        """Map CSV headers to standard field names"""
-        mapping = {}
+    def _detect_delimiter(cls, sample: str) -> str:
+        """Guess the delimiter from complete lines of the sample, defaulting to a comma"""
+        if "\n" in sample:
+            sample = sample[: sample.rindex("\n")]
+
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=cls.DELIMITERS).delimiter
+        except csv.Error:
+            return ","
 
-        for header in headers:
+    @classmethod
+    def _map_headers(cls, headers: list[str]) -> list[tuple[int, str]]:
+        """
+        Map CSV headers to standard field names.
+
+        Returns (column position, field) pairs so rows can be read by index;
+        headers are normalized here once rather than per row.
+        """
+        columns = []
+
+        for index, header in enumerate(headers):
             # Normalize header: lowercase, strip whitespace
             normalized = header.lower().strip().replace(" ", "_")
 
-            if normalized in cls.COLUMN_MAPPING:
-                mapping[header] = cls.COLUMN_MAPPING[normalized]
-            else:
-                # Keep original for unknown columns (might be useful)
-                mapping[header] = normalized
+            # Unknown columns keep their normalized name (might be useful)
+            columns.append((index, cls.COLUMN_MAPPING.get(normalized, normalized)))
 
-        return mapping
+        return columns
 
     @classmethod
-    def _process_row(cls, row: dict, header_mapping: dict, row_num: int) -> tuple[dict, list[str]]:
-        """Process a single CSV row"""
+    def _process_row(cls, row: list[str], columns: list[tuple[int, str]], row_num: int) -> tuple[dict, list[str]]:
+        """Process a single CSV row (columns are (position, mapped field) pairs)"""
         errors = []
         lead_data = {}
+        row_length = len(row)
 
-        for original_header, mapped_field in header_mapping.items():
-            value = row.get(original_header, "").strip()
+        for index, mapped_field in columns:
+            # Short rows simply leave the trailing fields empty
+            if index < row_length:
+                value = row[index].strip()
 
-            if value:
-                lead_data[mapped_field] = value
+                if value:
+                    lead_data[mapped_field] = value
 
         # Validate required fields
         if not lead_data.get("email"):
@@ -153,14 +254,14 @@ class CSVParser:
             errors.append(f"Row {row_num}: Invalid email format '{email}'")
             return None, errors
 
-        # Normalize email to lowercase
-        lead_data["email"] = email.lower()
-
         return lead_data, errors
 
     @classmethod
     def get_sample_csv(cls) -> str:
         """Generate a sample CSV template"""
+        if cls._sample_csv is not None:
+            return cls._sample_csv
+
         headers = ["email", "first_name", "last_name", "phone", "address", "property_type", "estimated_value"]
         sample_data = [
             ["john.doe@email.com", "John", "Doe", "555-1234", "123 Oak Street", "Single Family", "$450,000"],
@@ -172,4 +273,5 @@ class CSVParser:
         writer.writerow(headers)
         writer.writerows(sample_data)
 
-        return output.getvalue()
+        cls._sample_csv = output.getvalue()
+        return cls._sample_csv
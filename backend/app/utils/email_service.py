@@ -4,24 +4,56 @@ Email Service
 Handles all email sending operations.
 
 Modes:
-  - Mock (demo): Logs to console, no real emails sent
+  - Mock (demo): Logs each email (full message at DEBUG), no real emails sent
   - Production:  Sends via SendGrid API with full tracking
 
 Key features:
-  - send_campaign_email(): saves message_id back to DB so webhooks can track events
+  - send_campaign_batch(): campaign sends, one SendGrid request per 1000 recipients;
+    saves message ids back to DB so webhooks can track events
+  - send_campaign_email(): the same DB tracking for a single email
   - Retry logic with exponential backoff (3 attempts on failure)
   - Daily send rate limiter (email warming protection)
+  - Per-second token bucket on SendGrid API calls, with backoff on 429
   - Personalization template engine using {{placeholder}} syntax
 """
 
 import asyncio
+import logging
+import random
 import re
+import time
 import uuid
-from datetime import date, datetime
+from collections.abc import AsyncIterator, Iterable
+from datetime import UTC, date, datetime
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING
 
-from app.config import get_settings
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
 
-settings = get_settings()
+from app.config import settings
+from app.database import engine
+from app.models import DailySendCount, EmailSequence
+
+if TYPE_CHECKING:
+    import httpx
+
+# Sends log per email at DEBUG, per batch at INFO and problems at WARNING/ERROR,
+# so a production process (WARNING) stays quiet however many emails go out
+logger = logging.getLogger(__name__)
+
+
+SENDGRID_API_URL = "https://api.sendgrid.com/v3"
+
+# SendGrid accepts up to 1000 personalizations (recipients) per mail/send request
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+
+# Attempts per request when SendGrid answers 429 Too Many Requests
+SENDGRID_RATE_LIMIT_RETRIES = 5
+
+# {{field_name}} placeholder syntax used by all templates
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
 
 
 # ============================================
@@ -31,96 +63,294 @@ settings = get_settings()
 
 class DailySendLimiter:
     """
-    In-memory tracker for daily email send volume.
+    Tracker for daily email send volume, stored in the daily_send_counts table.
 
     Email warming = sending small batches at first to build sender
     reputation with Gmail/Outlook/Yahoo before ramping up to full volume.
     This prevents your domain from being flagged as spam when you're new.
 
-    Resets automatically at UTC midnight.
+    Every worker process increments the same row with one atomic upsert,
+    so the limit holds across a multi-worker deployment.
+    Resets automatically at UTC midnight (one row per UTC date).
     Controlled by SENDGRID_DAILY_SEND_LIMIT in .env
     """
 
-    def __init__(self):
-        self._count: int = 0
-        self._date: date = date.today()
-
-    def _reset_if_new_day(self):
-        today = date.today()
-        if today != self._date:
-            self._count = 0
-            self._date = today
-
-    def can_send(self) -> bool:
-        self._reset_if_new_day()
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(UTC).date()
+
+    async def record_send(self, count: int = 1):
+        stmt = insert(DailySendCount).values(day=self._today(), sent=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailySendCount.day], set_={"sent": DailySendCount.sent + stmt.excluded.sent}
+        )
+        # Own transaction: the send already happened, whatever the caller's session does next
+        async with engine.begin() as conn:
+            await conn.execute(stmt)
+
+    async def reserve(self, count: int) -> int:
+        """
+        Claim up to `count` of today's remaining sends and return how many were
+        granted. The day's row is locked while the headroom is checked, so two
+        batches (in any worker) can't both claim the same slots. Reserved
+        sends are counted at once; give back the ones that fail with release().
+        """
         limit = settings.SENDGRID_DAILY_SEND_LIMIT
         if limit <= 0:
-            return True  # 0 = unlimited
-        return self._count < limit
-
-    def record_send(self):
-        self._reset_if_new_day()
-        self._count += 1
+            await self.record_send(count)  # 0 = unlimited, still counted
+            return count
+
+        today = self._today()
+        async with engine.begin() as conn:
+            await conn.execute(insert(DailySendCount).values(day=today, sent=0).on_conflict_do_nothing())
+            sent = await conn.scalar(select(DailySendCount.sent).where(DailySendCount.day == today).with_for_update())
+            granted = max(0, min(count, limit - sent))
+            if granted:
+                await conn.execute(
+                    update(DailySendCount).where(DailySendCount.day == today).values(sent=DailySendCount.sent + granted)
+                )
+        return granted
+
+    async def release(self, count: int):
+        """Return reserved sends that were never delivered."""
+        if count <= 0:
+            return
+        async with engine.begin() as conn:
+            await conn.execute(
+                update(DailySendCount)
+                .where(DailySendCount.day == self._today())
+                .values(sent=func.greatest(DailySendCount.sent - count, 0))
+            )
 
-    @property
-    def remaining_today(self) -> int:
-        self._reset_if_new_day()
+    async def remaining_today(self) -> int:
         limit = settings.SENDGRID_DAILY_SEND_LIMIT
         if limit <= 0:
             return 999999
-        return max(0, limit - self._count)
+        return max(0, limit - await self.sent_today())
 
-    @property
-    def sent_today(self) -> int:
-        self._reset_if_new_day()
-        return self._count
+    async def sent_today(self) -> int:
+        async with engine.connect() as conn:
+            sent = await conn.scalar(select(DailySendCount.sent).where(DailySendCount.day == self._today()))
+        return sent or 0
 
 
-# Module-level singleton — shared across all requests in the same process
+# Module-level singleton — the count itself lives in the database
 _daily_limiter = DailySendLimiter()
 
 
+# ============================================
+# PER-SECOND API RATE LIMITER (Token Bucket)
+# ============================================
+
+
+class SendRateLimiter:
+    """
+    Async token bucket for outbound SendGrid API requests.
+
+    Holds to SENDGRID_RPS requests per second across every coroutine in
+    this process, with bursts of up to one second's worth of tokens.
+    Waiters queue on a lock, so they are released in arrival order.
+
+    SendGrid's own limits come back on every response: once
+    X-RateLimit-Remaining hits 0, or a 429 arrives, the whole bucket is
+    paused until the window resets instead of letting other sends walk
+    into the same 429.
+
+    Set SENDGRID_RPS=0 in .env to disable throttling (pauses still apply).
+    """
+
+    def __init__(self):
+        self._tokens: float = float(max(settings.SENDGRID_RPS, 0))
+        self._updated: float = time.monotonic()
+        self._resume_at: float = 0.0  # monotonic time until which nothing is sent
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Hold every acquire() for at least `seconds` from now."""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def observe(self, headers) -> None:
+        """Pause until X-RateLimit-Reset when a response reports the window's quota used up."""
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset = _header_float(headers, "X-RateLimit-Reset")  # Unix timestamp
+        if remaining is not None and remaining <= 0 and reset is not None:
+            self.pause(reset - time.time())
+
+    async def acquire(self):
+        rate = settings.SENDGRID_RPS
+        if rate <= 0 and self._resume_at <= time.monotonic():
+            return  # 0 = unthrottled
+
+        async with self._lock:
+            paused_for = self._resume_at - time.monotonic()
+            if paused_for > 0:
+                await asyncio.sleep(paused_for)
+            if rate <= 0:
+                return
+
+            now = time.monotonic()
+            self._tokens = min(rate, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+
+            if self._tokens < 1:
+                # Sleep until one token has refilled, then spend it
+                await asyncio.sleep((1 - self._tokens) / rate)
+                self._tokens = 0.0
+                self._updated = time.monotonic()
+            else:
+                self._tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+# Module-level singleton — every SendGrid call in this process draws from one bucket
+_rate_limiter = SendRateLimiter()
+
+
+def _header_float(headers, name: str) -> float | None:
+    """Numeric response header, or None when missing or not a number."""
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Exponential backoff (1s, 2s, 4s, ...) plus up to 1s of jitter so retries don't land together."""
+    return 2 ** (attempt - 1) + random.random()
+
+
 # ============================================
 # EMAIL SERVICE
 # ============================================
 
 
 class EmailService:
+    def __init__(self) -> None:
+        self._client: "httpx.AsyncClient | None" = None
+        # Settings are frozen, so the send backend and sender are fixed for the process
+        self._send_backend = self._send_via_sendgrid if settings.sendgrid_configured else self._send_mock
+        self._from_email = settings.SENDGRID_FROM_EMAIL
+
+    @property
+    def _sendgrid_client(self) -> "httpx.AsyncClient":
+        """
+        Async HTTP client for the SendGrid API, created on the first real send
+        and reused after that so its connection pool stays warm.
+        Demo deployments never import httpx.
+        """
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                base_url=SENDGRID_API_URL,
+                headers={"Authorization": f"Bearer {settings.SENDGRID_API_KEY}"},
+                timeout=30,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the SendGrid HTTP client. Called on application shutdown."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     # ----------------------------------------
     # TEMPLATE PERSONALIZATION
     # ----------------------------------------
 
     @staticmethod
-    def personalize_template(template: str, lead_data: dict) -> str:
+    def field_values(lead_data: dict) -> dict[str, str]:
         """
-        Replace {{placeholders}} with actual lead data.
+        Map each supported placeholder field name to its value for one lead.
 
-        Supported placeholders:
-          {{first_name}}, {{last_name}}, {{full_name}},
-          {{email}}, {{phone}}, {{address}},
-          {{property_type}}, {{estimated_value}}, {{lead_id}}
-        """
-        placeholders = {
-            "{{first_name}}": lead_data.get("first_name", ""),
-            "{{last_name}}": lead_data.get("last_name", ""),
-            "{{email}}": lead_data.get("email", ""),
-            "{{phone}}": lead_data.get("phone", ""),
-            "{{address}}": lead_data.get("address", ""),
-            "{{property_type}}": lead_data.get("property_type", ""),
-            "{{estimated_value}}": lead_data.get("estimated_value", ""),
-            "{{lead_id}}": str(lead_data.get("lead_id", "")),
-            "{{full_name}}": (f"{lead_data.get('first_name', '')} " f"{lead_data.get('last_name', '')}".strip()),
+        Supported fields:
+          first_name, last_name, full_name,
+          email, phone, address,
+          property_type, estimated_value, lead_id
+        """
+        fields = {
+            "first_name": lead_data.get("first_name", ""),
+            "last_name": lead_data.get("last_name", ""),
+            "email": lead_data.get("email", ""),
+            "phone": lead_data.get("phone", ""),
+            "address": lead_data.get("address", ""),
+            "property_type": lead_data.get("property_type", ""),
+            "estimated_value": lead_data.get("estimated_value", ""),
+            "lead_id": str(lead_data.get("lead_id", "")),
+            "full_name": (f"{lead_data.get('first_name', '')} " f"{lead_data.get('last_name', '')}".strip()),
         }
-        result = template
-        for placeholder, value in placeholders.items():
-            result = result.replace(placeholder, str(value) if value else "")
-        return result
+        return {name: str(value) if value else "" for name, value in fields.items()}
+
+    @staticmethod
+    def placeholder_values(lead_data: dict) -> dict[str, str]:
+        """Map each supported {{placeholder}} to its value for one lead (see field_values())."""
+        return {f"{{{{{name}}}}}": value for name, value in EmailService.field_values(lead_data).items()}
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def compile_template(template: str) -> tuple[str, ...]:
+        """
+        Split a template into literal text and placeholder names, once.
+
+        Even indexes hold literal text, odd indexes hold field names:
+          "Hi {{first_name}}!" -> ("Hi ", "first_name", "!")
+
+        Cached on the template text, so a campaign's subject/body are
+        parsed once no matter how many leads they are rendered for.
+        """
+        return tuple(_PLACEHOLDER_RE.split(template))
+
+    @staticmethod
+    def render_template(compiled: tuple[str, ...], lead_data: dict) -> str:
+        """
+        Render a compile_template() result for one lead.
+        Unknown placeholders are left in place as {{name}}.
+        """
+        if len(compiled) == 1:
+            return compiled[0]  # No placeholders — nothing to fill
+        return EmailService._render(compiled, EmailService.field_values(lead_data))
+
+    @staticmethod
+    def render_message(subject_parts: tuple[str, ...], body_parts: tuple[str, ...], lead_data: dict) -> tuple[str, str]:
+        """
+        Render a compiled subject and body for one lead, returning (subject, body).
+        The lead's field values are built once and shared by both, and not at
+        all when neither has a placeholder.
+        """
+        if len(subject_parts) == 1 and len(body_parts) == 1:
+            return subject_parts[0], body_parts[0]
+        values = EmailService.field_values(lead_data)
+        return EmailService._render(subject_parts, values), EmailService._render(body_parts, values)
+
+    @staticmethod
+    def _render(compiled: tuple[str, ...], values: dict[str, str]) -> str:
+        """Fill the field slots of a compile_template() result from `values`."""
+        parts = list(compiled)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = values[name] if name in values else f"{{{{{name}}}}}"
+        return "".join(parts)
+
+    @staticmethod
+    def personalize_template(template: str, lead_data: dict) -> str:
+        """
+        Replace {{placeholders}} with actual lead data.
+        See field_values() for the supported placeholders.
+        """
+        if "{{" not in template:
+            return template
+        return EmailService.render_template(EmailService.compile_template(template), lead_data)
 
     @staticmethod
     def extract_placeholders(template: str) -> list[str]:
         """Return list of all {{placeholder}} names found in a template."""
-        return re.findall(r"\{\{(\w+)\}\}", template)
+        return list(EmailService.compile_template(template)[1::2])
 
     # ----------------------------------------
     # CORE SEND (auto-routes mock vs SendGrid)
@@ -129,7 +359,8 @@ class EmailService:
     async def send_email(self, to_email: str, subject: str, body: str, from_email: str | None = None) -> dict:
         """
         Send a single email. Does NOT update the database.
-        Use send_campaign_email() for campaign sends with DB tracking.
+        Use send_campaign_batch() for campaign sends with DB tracking
+        (send_campaign_email() for a single tracked email).
 
         Returns:
             {
@@ -140,12 +371,7 @@ class EmailService:
               "error": str   (only on failure)
             }
         """
-        from_email = from_email or settings.SENDGRID_FROM_EMAIL
-
-        if settings.sendgrid_configured:
-            return await self._send_via_sendgrid(to_email, subject, body, from_email)
-        else:
-            return await self._send_mock(to_email, subject, body, from_email)
+        return await self._send_backend(to_email, subject, body, from_email or self._from_email)
 
     # ----------------------------------------
     # PRODUCTION SEND WITH DB TRACKING + RETRY
@@ -164,7 +390,8 @@ class EmailService:
         """
         Production email send with full DB tracking and retry logic.
 
-        Use this in campaigns instead of send_email() directly.
+        Use this for a single tracked email instead of send_email() directly;
+        campaigns send through send_campaign_batch().
 
         What this does beyond send_email():
           1. Checks daily send limit (email warming protection)
@@ -184,18 +411,19 @@ class EmailService:
             db:          Active AsyncSession — the caller handles commit
         """
         # ---- Daily limit check ----
-        if not _daily_limiter.can_send():
+        # The slot is claimed before sending (as in send_campaign_batch), so concurrent sends can't overshoot
+        if not await _daily_limiter.reserve(1):
             msg = (
                 f"Daily send limit reached ({settings.SENDGRID_DAILY_SEND_LIMIT}/day). "
                 f"Increase SENDGRID_DAILY_SEND_LIMIT in .env or wait until tomorrow UTC."
             )
-            print(f"⛔ {msg}")
+            logger.warning("⛔ %s", msg)
             return {
                 "success": False,
                 "error": msg,
                 "skipped_daily_limit": True,
                 "mode": "sendgrid" if settings.sendgrid_configured else "mock",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(UTC).isoformat(),
             }
 
         # ---- Send with retry and exponential backoff ----
@@ -205,8 +433,6 @@ class EmailService:
             last_result = await self.send_email(to_email, subject, body, from_email)
 
             if last_result.get("success"):
-                _daily_limiter.record_send()
-
                 # ---- CRITICAL: Save message_id to DB ----
                 # This links SendGrid events back to our EmailSequence rows.
                 if sequence_id and db:
@@ -214,49 +440,199 @@ class EmailService:
 
                 return last_result
 
+            # Rejected for good (4xx), or still rate limited after the 429 backoff — retrying won't help
+            if _is_final_failure(last_result):
+                break
+
             # Failed — retry with backoff
             if attempt < max_retries:
-                wait_seconds = 2 ** (attempt - 1)  # 1s, 2s, 4s
-                print(
-                    f"⚠️  Send attempt {attempt}/{max_retries} failed for {to_email}. "
-                    f"Retrying in {wait_seconds}s... "
-                    f"(error: {last_result.get('error')})"
+                wait_seconds = _backoff_seconds(attempt)
+                logger.warning(
+                    "⚠️  Send attempt %d/%d failed for %s. Retrying in %.1fs... (error: %s)",
+                    attempt,
+                    max_retries,
+                    to_email,
+                    wait_seconds,
+                    last_result.get("error"),
                 )
                 await asyncio.sleep(wait_seconds)
             else:
-                print(
-                    f"❌ All {max_retries} send attempts failed for {to_email}. "
-                    f"Last error: {last_result.get('error')}"
+                logger.error(
+                    "❌ All %d send attempts failed for %s. Last error: %s",
+                    max_retries,
+                    to_email,
+                    last_result.get("error"),
                 )
 
+        # Never delivered — give the reserved slot back
+        await _daily_limiter.release(1)
         return last_result
 
     async def _persist_message_id(self, db, sequence_id: int, message_id: str):
         """
-        Save the SendGrid message_id to the EmailSequence row.
+        Save the SendGrid message_id to the EmailSequence row (one UPDATE, no SELECT).
         Called after a successful send in send_campaign_email().
         Note: caller is responsible for db.commit().
         """
         try:
-            from sqlalchemy import select
-
-            from app.models import EmailSequence
-
-            result = await db.execute(select(EmailSequence).where(EmailSequence.id == sequence_id))
-            sequence = result.scalar_one_or_none()
+            now = datetime.now(UTC)
+            result = await db.execute(
+                update(EmailSequence)
+                .where(EmailSequence.id == sequence_id)
+                .values(sendgrid_message_id=message_id, status="sent", sent_at=now, updated_at=now)
+            )
 
-            if sequence:
-                sequence.sendgrid_message_id = message_id
-                sequence.status = "sent"
-                sequence.sent_at = datetime.utcnow()
-                sequence.updated_at = datetime.utcnow()
-                print(f"💾 Saved message_id '{message_id}' → sequence {sequence_id}")
+            if result.rowcount:
+                logger.debug("💾 Saved message_id '%s' → sequence %s", message_id, sequence_id)
             else:
-                print(f"⚠️  EmailSequence {sequence_id} not found — message_id not saved")
+                logger.warning("⚠️  EmailSequence %s not found — message_id not saved", sequence_id)
 
         except Exception as e:
             # Log but don't fail the send response
-            print(f"⚠️  Failed to persist message_id to sequence {sequence_id}: {e}")
+            logger.error("⚠️  Failed to persist message_id to sequence %s: %s", sequence_id, e)
+
+    # ----------------------------------------
+    # CAMPAIGN BATCH SEND (one API call per 1000 recipients)
+    # ----------------------------------------
+
+    async def send_campaign_batch(
+        self,
+        subject_template: str,
+        body_template: str,
+        recipients: list[dict],
+        db,
+        from_email: str | None = None,
+        max_retries: int = 3,
+    ) -> dict:
+        """
+        Send one campaign's emails to many recipients with DB tracking.
+
+        In SendGrid mode every chunk of up to 1000 recipients is ONE
+        mail/send request: each recipient is a personalizations[] entry whose
+        substitutions fill the {{placeholders}} and whose custom_args carry
+        the sequence_id (SendGrid echoes it back on every webhook event, since
+        all recipients of a request share the same X-Message-Id). A chunk
+        SendGrid rejects outright (4xx, e.g. one malformed address) is sent
+        again one email at a time, each with its own message id.
+
+        Args:
+            recipients: lead_data dicts (see field_values) plus "sequence_id"
+            db:         Active AsyncSession — the caller handles commit
+
+        Returns:
+            {"sent": [sequence_id, ...], "failed": {sequence_id: error, ...}}
+        """
+        from_email = from_email or settings.SENDGRID_FROM_EMAIL
+        results: dict = {"sent": [], "failed": {}}
+
+        # ---- Daily limit check ----
+        # Slots are claimed up front, so concurrent campaigns can't overshoot the limit together
+        allowed = recipients[: await _daily_limiter.reserve(len(recipients))]
+        if len(allowed) < len(recipients):
+            msg = (
+                f"Daily send limit reached ({settings.SENDGRID_DAILY_SEND_LIMIT}/day). "
+                f"Increase SENDGRID_DAILY_SEND_LIMIT in .env or wait until tomorrow UTC."
+            )
+            logger.warning("⛔ %s — %d email(s) not sent", msg, len(recipients) - len(allowed))
+            for r in recipients[len(allowed) :]:
+                results["failed"][r["sequence_id"]] = msg
+
+        for start in range(0, len(allowed), SENDGRID_MAX_PERSONALIZATIONS):
+            chunk = allowed[start : start + SENDGRID_MAX_PERSONALIZATIONS]
+
+            if settings.sendgrid_configured:
+                result = await self._send_batch_with_retry(
+                    subject_template, body_template, chunk, from_email, max_retries
+                )
+                if result.get("success"):
+                    message_ids = {r["sequence_id"]: result["message_id"] for r in chunk}
+                else:
+                    failed = {}
+                    if _is_final_failure(result) and result.get("status_code") != 429:
+                        # SendGrid rejects the whole request for one bad recipient — send the
+                        # chunk one email at a time so only the recipients that really fail are marked
+                        details = await self._send_each(chunk, subject_template, body_template, from_email)
+                        message_ids = {}
+                        for r, detail in zip(chunk, details, strict=True):
+                            if detail["success"]:
+                                message_ids[r["sequence_id"]] = detail["message_id"]
+                            else:
+                                failed[r["sequence_id"]] = detail["error"] or "Send failed"
+                    else:
+                        message_ids = {}
+                        failed = {r["sequence_id"]: result.get("error", "Send failed") for r in chunk}
+                    results["failed"].update(failed)
+                    await _daily_limiter.release(len(failed))
+            else:
+                message_ids = {}
+                subject_parts = self.compile_template(subject_template)
+                body_parts = self.compile_template(body_template)
+                for r in chunk:
+                    subject, body = self.render_message(subject_parts, body_parts, r)
+                    mock = await self._send_mock(r["email"], subject, body, from_email)
+                    message_ids[r["sequence_id"]] = mock["message_id"]
+
+            await self._persist_message_ids(db, message_ids)
+            results["sent"].extend(message_ids)
+
+        return results
+
+    async def _send_batch_with_retry(
+        self, subject_template: str, body_template: str, chunk: list[dict], from_email: str, max_retries: int
+    ) -> dict:
+        """One SendGrid request for the chunk, retried with exponential backoff."""
+        result: dict = {}
+        for attempt in range(1, max_retries + 1):
+            result = await self._send_batch_via_sendgrid(subject_template, body_template, chunk, from_email)
+            # 4xx won't succeed on retry, and a 429 already went through the rate-limit backoff
+            if result.get("success") or _is_final_failure(result):
+                return result
+
+            error = result.get("error")
+            if attempt < max_retries:
+                wait_seconds = _backoff_seconds(attempt)
+                logger.warning(
+                    "⚠️  Batch send attempt %d/%d failed (%d recipients). Retrying in %.1fs... (error: %s)",
+                    attempt,
+                    max_retries,
+                    len(chunk),
+                    wait_seconds,
+                    error,
+                )
+                await asyncio.sleep(wait_seconds)
+            else:
+                logger.error(
+                    "❌ All %d batch send attempts failed (%d recipients). Last error: %s",
+                    max_retries,
+                    len(chunk),
+                    error,
+                )
+        return result
+
+    async def _persist_message_ids(self, db, message_ids: dict[int, str]):
+        """
+        Mark the sent EmailSequence rows and store their message ids
+        (one executemany UPDATE by primary key).
+        Note: caller is responsible for db.commit().
+        """
+        if not message_ids:
+            return
+
+        now = datetime.now(UTC)
+        await db.execute(
+            update(EmailSequence),
+            [
+                {
+                    "id": sequence_id,
+                    "sendgrid_message_id": message_id,
+                    "status": "sent",
+                    "sent_at": now,
+                    "updated_at": now,
+                }
+                for sequence_id, message_id in message_ids.items()
+            ],
+        )
+        logger.debug("💾 Saved message ids for %d sequence(s)", len(message_ids))
 
     # ----------------------------------------
     # BULK SEND (no DB tracking)
@@ -265,41 +641,84 @@ class EmailService:
     async def send_bulk(self, emails: list[dict], subject_template: str, body_template: str) -> dict:
         """
         Send personalized emails to a list of lead dicts.
-        No DB tracking — for campaign sends use send_campaign_email() per lead.
+        No DB tracking — for campaign sends use send_campaign_batch().
+
+        Collects send_bulk_stream() into one summary; details keep the order
+        of `emails`. For very large runs iterate send_bulk_stream() directly
+        so the details are never all held in memory.
         """
-        results = {"total": len(emails), "sent": 0, "failed": 0, "details": []}
+        details = []
+        async for chunk_details in self.send_bulk_stream(emails, subject_template, body_template):
+            details.extend(chunk_details)
 
-        for lead_data in emails:
-            to_email = lead_data.get("email")
-            subject = self.personalize_template(subject_template, lead_data)
-            body = self.personalize_template(body_template, lead_data)
-            result = await self.send_email(to_email, subject, body)
+        sent = sum(1 for detail in details if detail["success"])
+
+        return {"total": len(details), "sent": sent, "failed": len(details) - sent, "details": details}
 
+    async def send_bulk_stream(
+        self, emails: Iterable[dict], subject_template: str, body_template: str
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Send personalized emails chunk by chunk, yielding the detail dicts of
+        every SENDGRID_MAX_PERSONALIZATIONS emails as soon as they are sent.
+        `emails` may be any iterable (e.g. a generator), and only one chunk of
+        it is pulled at a time.
+
+        In SendGrid mode every chunk is ONE mail/send request (a
+        personalizations[] entry per lead, as in send_campaign_batch);
+        a chunk whose request fails is sent again one email at a time.
+        """
+        emails = iter(emails)
+        while chunk := list(islice(emails, SENDGRID_MAX_PERSONALIZATIONS)):
+            if not settings.sendgrid_configured:
+                yield await self._send_each(chunk, subject_template, body_template)
+                continue
+
+            result = await self._send_batch_via_sendgrid(subject_template, body_template, chunk, self._from_email)
             if result.get("success"):
-                results["sent"] += 1
+                yield [
+                    {"email": r.get("email"), "success": True, "message_id": result["message_id"], "error": None}
+                    for r in chunk
+                ]
             else:
-                results["failed"] += 1
+                yield await self._send_each(chunk, subject_template, body_template)
 
-            results["details"].append(
-                {
-                    "email": to_email,
-                    "success": result.get("success"),
-                    "message_id": result.get("message_id"),
-                    "error": result.get("error"),
-                }
-            )
+    async def _send_each(
+        self, emails: list[dict], subject_template: str, body_template: str, from_email: str | None = None
+    ) -> list[dict]:
+        """
+        Render and send each email on its own, returning one detail dict per email.
+        Up to SENDGRID_SEND_CONCURRENCY sends run at once (each one waits on
+        the network, not the CPU).
+        """
+        subject_parts = self.compile_template(subject_template)
+        body_parts = self.compile_template(body_template)
+        semaphore = asyncio.Semaphore(max(settings.SENDGRID_SEND_CONCURRENCY, 1))
 
-        return results
+        async def send_one(lead_data: dict) -> dict:
+            to_email = lead_data.get("email")
+            subject, body = self.render_message(subject_parts, body_parts, lead_data)
+            async with semaphore:
+                result = await self.send_email(to_email, subject, body, from_email)
+
+            return {
+                "email": to_email,
+                "success": result.get("success"),
+                "message_id": result.get("message_id"),
+                "error": result.get("error"),
+            }
+
+        return await asyncio.gather(*(send_one(lead_data) for lead_data in emails))
 
     # ----------------------------------------
     # SEND STATUS (for dashboard)
     # ----------------------------------------
 
-    def get_send_status(self) -> dict:
+    async def get_send_status(self) -> dict:
         """Returns current daily send status. Use on dashboard endpoint."""
         return {
-            "sent_today": _daily_limiter.sent_today,
-            "remaining_today": _daily_limiter.remaining_today,
+            "sent_today": await _daily_limiter.sent_today(),
+            "remaining_today": await _daily_limiter.remaining_today(),
             "daily_limit": settings.SENDGRID_DAILY_SEND_LIMIT,
             "unlimited": settings.SENDGRID_DAILY_SEND_LIMIT <= 0,
             "mode": "sendgrid" if settings.sendgrid_configured else "mock",
@@ -310,24 +729,27 @@ class EmailService:
     # ----------------------------------------
 
     async def _send_mock(self, to_email: str, subject: str, body: str, from_email: str | None) -> dict:
-        """Mock send — logs to console, no real email sent."""
+        """Mock send — logs one line (the full message at DEBUG), no real email sent."""
         message_id = f"mock_{uuid.uuid4().hex[:12]}"
+        timestamp = datetime.now(UTC).isoformat()
+
+        logger.info("📧 Mock email → %s | ID: %s | Subject: %s", to_email, message_id, subject)
+        if logger.isEnabledFor(logging.DEBUG):
+            preview = body[:300] + "..." if len(body) > 300 else body
+            logger.debug(
+                "\n%s\n  From:    %s\n  To:      %s\n  Subject: %s\n%s\n  Body:\n%s\n%s\n  Timestamp  : %s\n%s",
+                "=" * 60,
+                from_email or "noreply@demo.com",
+                to_email,
+                subject,
+                "-" * 60,
+                preview,
+                "=" * 60,
+                timestamp,
+                "=" * 60,
+            )
 
-        print("\n" + "=" * 60)
-        print("📧 MOCK EMAIL (Demo Mode — configure SendGrid to send real emails)")
-        print("=" * 60)
-        print(f"  From:    {from_email or 'noreply@demo.com'}")
-        print(f"  To:      {to_email}")
-        print(f"  Subject: {subject}")
-        print("-" * 60)
-        preview = body[:300] + "..." if len(body) > 300 else body
-        print(f"  Body:\n{preview}")
-        print("=" * 60)
-        print(f"  Message ID : {message_id}")
-        print(f"  Timestamp  : {datetime.utcnow().isoformat()}Z")
-        print("=" * 60 + "\n")
-
-        return {"success": True, "message_id": message_id, "mode": "mock", "timestamp": datetime.utcnow().isoformat()}
+        return {"success": True, "message_id": message_id, "mode": "mock", "timestamp": timestamp}
 
     # ----------------------------------------
     # PRIVATE: SENDGRID SEND
@@ -336,41 +758,147 @@ class EmailService:
     async def _send_via_sendgrid(self, to_email: str, subject: str, body: str, from_email: str | None) -> dict:
         """Send via SendGrid API. Only called when API key + from_email are configured."""
         try:
-            from sendgrid import SendGridAPIClient
-            from sendgrid.helpers.mail import Content, Email, Mail, To
-
-            message = Mail(
-                from_email=Email(from_email, settings.SENDGRID_FROM_NAME),
-                to_emails=To(to_email),
-                subject=subject,
-                html_content=Content("text/html", body),
-            )
-
-            sg = SendGridAPIClient(settings.SENDGRID_API_KEY)
-            response = sg.send(message)
+            payload = self._sendgrid_payload(from_email, subject, body, [{"to": [{"email": to_email}]}])
+            response = await self._post_to_sendgrid(payload)
 
             message_id = response.headers.get("X-Message-Id", f"sg_{uuid.uuid4().hex[:12]}")
 
-            print(f"✅ Email sent → {to_email} | ID: {message_id} | Status: {response.status_code}")
+            logger.debug("✅ Email sent → %s | ID: %s | Status: %d", to_email, message_id, response.status_code)
 
             return {
                 "success": True,
                 "message_id": message_id,
                 "mode": "sendgrid",
                 "status_code": response.status_code,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(UTC).isoformat(),
             }
 
         except Exception as e:
             error_msg = str(e)
-            print(f"❌ SendGrid error sending to {to_email}: {error_msg}")
+            logger.error("❌ SendGrid error sending to %s: %s", to_email, error_msg)
             return {
                 "success": False,
                 "error": error_msg,
+                "status_code": _status_code(e),
+                "rate_limited": _is_rate_limited(e),
                 "mode": "sendgrid",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(UTC).isoformat(),
+            }
+
+    async def _send_batch_via_sendgrid(
+        self, subject_template: str, body_template: str, chunk: list[dict], from_email: str | None
+    ) -> dict:
+        """One mail/send request with a personalizations[] entry per recipient."""
+        try:
+            personalizations = []
+            for r in chunk:
+                personalization = {"to": [{"email": r["email"]}], "substitutions": self.placeholder_values(r)}
+                # Campaign sends tag each recipient so webhook events map back to its row
+                if "sequence_id" in r:
+                    personalization["custom_args"] = {"sequence_id": str(r["sequence_id"])}
+                personalizations.append(personalization)
+
+            payload = self._sendgrid_payload(from_email, subject_template, body_template, personalizations)
+            response = await self._post_to_sendgrid(payload)
+
+            message_id = response.headers.get("X-Message-Id", f"sg_{uuid.uuid4().hex[:12]}")
+
+            logger.info(
+                "✅ Batch sent → %d recipients | ID: %s | Status: %d", len(chunk), message_id, response.status_code
+            )
+
+            return {"success": True, "message_id": message_id, "status_code": response.status_code}
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error("❌ SendGrid error sending batch of %d: %s", len(chunk), error_msg)
+            return {
+                "success": False,
+                "error": error_msg,
+                "status_code": _status_code(e),
+                "rate_limited": _is_rate_limited(e),
             }
 
+    @staticmethod
+    def _sendgrid_payload(from_email: str | None, subject: str, body: str, personalizations: list[dict]) -> dict:
+        """mail/send request body: one HTML message delivered to each personalizations[] entry."""
+        sender = {"email": from_email}
+        if settings.SENDGRID_FROM_NAME:
+            sender["name"] = settings.SENDGRID_FROM_NAME
+        return {
+            "personalizations": personalizations,
+            "from": sender,
+            "subject": subject,
+            "content": [{"type": "text/html", "value": body}],
+        }
+
+    async def _post_to_sendgrid(self, payload: dict) -> "httpx.Response":
+        """
+        Send one mail/send request through the shared rate limiter.
+
+        429 responses are retried up to SENDGRID_RATE_LIMIT_RETRIES attempts,
+        waiting as long as SendGrid asks (Retry-After, else X-RateLimit-Reset)
+        or, without either header, with jittered exponential backoff. The wait
+        pauses the shared limiter, so concurrent sends hold off too. Any other
+        error status, or a 429 on the final attempt, is raised to the caller
+        as httpx.HTTPStatusError.
+        """
+        for attempt in range(1, SENDGRID_RATE_LIMIT_RETRIES + 1):
+            async with _rate_limiter:
+                response = await self._sendgrid_client.post("/mail/send", json=payload)
+            _rate_limiter.observe(response.headers)
+            if response.is_success:
+                return response
+            if response.status_code != 429 or attempt == SENDGRID_RATE_LIMIT_RETRIES:
+                import httpx
+
+                raise httpx.HTTPStatusError(
+                    f"SendGrid HTTP {response.status_code}: {response.text}",
+                    request=response.request,
+                    response=response,
+                )
+            wait_seconds = _retry_after_seconds(response.headers, attempt)
+            logger.warning(
+                "🐢 SendGrid rate limited (429), attempt %d/%d. Retrying in %.1fs...",
+                attempt,
+                SENDGRID_RATE_LIMIT_RETRIES,
+                wait_seconds,
+            )
+            _rate_limiter.pause(wait_seconds)
+
+
+def _retry_after_seconds(headers, attempt: int) -> float:
+    """How long to back off after a 429: what SendGrid asked for, else jittered exponential backoff."""
+    retry_after = _header_float(headers, "Retry-After")
+    if retry_after is None:
+        reset = _header_float(headers, "X-RateLimit-Reset")
+        if reset is None:
+            return _backoff_seconds(attempt)
+        retry_after = reset - time.time()
+    return max(retry_after, 0.0) + random.random()
+
+
+def _status_code(error: Exception) -> int | None:
+    """HTTP status of a failed SendGrid send, or None for network errors/timeouts."""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """True when a SendGrid send failed with HTTP 429."""
+    return _status_code(error) == 429
+
+
+def _is_final_failure(result: dict) -> bool:
+    """
+    True when retrying a failed send can't help: a 4xx other than 408 means
+    the request itself was rejected (bad address, auth, payload), and a 429
+    has already been retried by the rate-limit backoff. 5xx, 408 and network
+    errors stay retryable.
+    """
+    status = result.get("status_code")
+    return status is not None and 400 <= status < 500 and status != 408
+
 
 # ============================================
 # SINGLETON INSTANCE
@@ -0,0 +1,55 @@
+"""
+Pagination Helper
+==================
+Fetches one page of a list endpoint together with its total match count.
+
+The filters are built once and shared by every query the helper runs.
+"""
+
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def fetch_page(
+    db: AsyncSession, model: Any, filters: list, order_by: tuple, offset: int, limit: int
+) -> tuple[list[Any], int]:
+    """
+    Return (items, total) for one page of `model` rows matching `filters`.
+
+    First page: fetch one row more than the page holds. If it doesn't fill up,
+    those rows are every match and the total is their count — no COUNT at all,
+    which covers most searches and small tables. Only a full first page
+    needs a separate COUNT(*).
+
+    Later pages: COUNT(*) OVER () is evaluated before LIMIT/OFFSET, so every
+    returned row carries the total and one query does both. Only when the page
+    is past the end (no rows to carry the window count) is COUNT(*) run.
+    """
+    if offset == 0:
+        result = await db.execute(select(model).where(*filters).order_by(*order_by).limit(limit + 1))
+        items = list(result.scalars())
+        if len(items) <= limit:
+            return items, len(items)
+        return items[:limit], await _count(db, model, filters)
+
+    result = await db.execute(
+        select(model, func.count().over().label("total_count"))
+        .where(*filters)
+        .order_by(*order_by)
+        .offset(offset)
+        .limit(limit)
+    )
+    rows = result.all()
+
+    if rows:
+        return [row[0] for row in rows], rows[0].total_count
+
+    return [], await _count(db, model, filters)
+
+
+async def _count(db: AsyncSession, model: Any, filters: list) -> int:
+    """COUNT(*) of `model` rows matching `filters`."""
+    result = await db.execute(select(func.count()).select_from(model).where(*filters))
+    return result.scalar()
@@ -12,9 +12,8 @@ Placeholders: Same as email — {{first_name}}, {{lead_id}}, etc.
 
 import asyncio
 
-from app.config import get_settings
+from app.config import settings
 
-settings = get_settings()
 
 # Lazy Twilio client (only when configured)
 _twilio_client = None
@@ -14,11 +14,8 @@ Modes:
   - Production: Calls Retell API, returns real call_id.
 """
 
-import httpx
+from app.config import settings
 
-from app.config import get_settings
-
-settings = get_settings()
 
 RETELL_API_BASE = "https://api.retellai.com"
 
@@ -79,6 +76,9 @@ class VoiceService:
             "Content-Type": "application/json",
         }
 
+        # Imported here so demo-mode deployments never pay httpx's import cost at boot
+        import httpx
+
         try:
             async with httpx.AsyncClient(timeout=30) as client:
                 resp = await client.post(
@@ -109,6 +109,8 @@ class VoiceService:
         headers = {
             "Authorization": f"Bearer {settings.RETELL_API_KEY}",
         }
+        import httpx
+
         try:
             async with httpx.AsyncClient(timeout=15) as client:
                 resp = await client.get(
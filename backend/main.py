@@ -3,16 +3,34 @@ Real Estate Outreach Automation System - Main Application
 FastAPI entry point
 """
 
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-from app.config import get_settings
+from app.config import settings
 from app.database import close_db, init_db
+from app.utils.email_service import email_service
 
-# Get settings
-settings = get_settings()
+
+# ============================================
+# LOGGING - app.* loggers (uvicorn configures its own)
+# ============================================
+# DEBUG shows every email sent; production only warnings and errors
+if settings.is_production:
+    _log_level = logging.WARNING
+elif settings.DEBUG:
+    _log_level = logging.DEBUG
+else:
+    _log_level = logging.INFO
+
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+_app_logger = logging.getLogger("app")
+_app_logger.addHandler(_log_handler)
+_app_logger.setLevel(_log_level)
 
 
 # ============================================
@@ -23,7 +41,7 @@ async def lifespan(app: FastAPI):
     """
     Handles startup and shutdown events.
     - Startup: Initialize database tables
-    - Shutdown: Close database connections
+    - Shutdown: Close database connections and the SendGrid HTTP client
     """
     # STARTUP
     print("🚀 Starting up...")
@@ -61,6 +79,7 @@ async def lifespan(app: FastAPI):
     print("👋 Shutting down...")
     await close_db()
     print("✅ Database connections closed!")
+    await email_service.close()
 
 
 # ============================================
@@ -82,7 +101,7 @@ app = FastAPI(
 # Always allow Render frontend; merge with any env CORS_ORIGINS
 FRONTEND_ORIGIN_RENDER = "https://real-estate-outreach-frontend.onrender.com"
 _cors_origins = list(settings.cors_origins_list)
-if FRONTEND_ORIGIN_RENDER not in _cors_origins:
+if FRONTEND_ORIGIN_RENDER not in settings.cors_origins_set:
     _cors_origins.append(FRONTEND_ORIGIN_RENDER)
 
 app.add_middleware(
@@ -94,6 +113,14 @@ app.add_middleware(
 )
 
 
+# ============================================
+# GZIP MIDDLEWARE
+# ============================================
+# Lead/campaign lists are repetitive JSON (same keys, many nulls) and shrink
+# several times over; small responses are sent as-is.
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
+
 # ============================================
 # HEALTH CHECK ENDPOINTS
 # ============================================